@@ -1,11 +1,20 @@
 """Intelligent alert system with conditional triggers."""
 from typing import Dict, List, Optional
 from datetime import datetime
-import json
+import orjson
 from pathlib import Path
 from loguru import logger
 from config import config
+import numpy as np
 import asyncio
+import queue
+import smtplib
+import threading
+import requests
+
+
+# Upper bound (seconds) on a single notification channel round-trip
+ALERT_SEND_TIMEOUT = 10
 
 
 class AlertCondition:
@@ -30,9 +39,14 @@ class AlertCondition:
         self.es_level = es_level
         self.distance_threshold = distance_threshold or config.alert_distance_threshold
         self.volume_threshold = volume_threshold
+        self._thresh_sq = self.distance_threshold * self.distance_threshold
         self.triggered = False
         self.trigger_time = None
         
+        # AlertSystem this condition was added to; told when the triggered
+        # state changes so it refreshes its arrays
+        self._owner = None
+        
     def check(
         self,
         current_es_price: float,
@@ -49,10 +63,10 @@ class AlertCondition:
         Returns:
             True if alert should trigger
         """
-        # Check distance
-        distance = abs(current_es_price - self.es_level)
+        # Check distance (squared, so no abs() call on the hot path)
+        offset = current_es_price - self.es_level
         
-        if distance > self.distance_threshold:
+        if offset * offset > self._thresh_sq:
             return False
         
         # Check volume if threshold is set
@@ -70,10 +84,23 @@ class AlertCondition:
         
         return True
     
-    def trigger(self):
-        """Mark alert as triggered."""
+    def trigger(self, trigger_time: Optional[datetime] = None):
+        """Mark alert as triggered.
+        
+        Args:
+            trigger_time: Time of the trigger (default: now)
+        """
         self.triggered = True
-        self.trigger_time = datetime.now()
+        self.trigger_time = trigger_time or datetime.now()
+        if self._owner is not None:
+            self._owner._arrays_dirty = True
+    
+    def reset(self):
+        """Clear the triggered state so the alert can fire again."""
+        self.triggered = False
+        self.trigger_time = None
+        if self._owner is not None:
+            self._owner._arrays_dirty = True
 
 
 class AlertSystem:
@@ -84,6 +111,23 @@ class AlertSystem:
         self.conditions: List[AlertCondition] = []
         self.alert_history: List[Dict] = []
         self.alert_log_file = config.logs_dir / "alerts.jsonl"
+        self._alert_log_handle = None  # opened lazily, kept open across checks
+        
+        # Parallel arrays mirroring self.conditions for vectorized checks,
+        # rebuilt lazily by check_all_conditions once marked dirty
+        self._rebuild_condition_arrays()
+        self._arrays_dirty = False
+        
+        # Notifications are delivered by a background worker so a slow
+        # channel never blocks alert evaluation
+        self._send_queue: "queue.Queue[tuple]" = queue.Queue()
+        self._send_worker: Optional[threading.Thread] = None
+        
+        # Long-lived channel clients, reused across alerts to skip the
+        # per-alert TCP/TLS handshakes
+        self._http = requests.Session()
+        self._telegram_bot = None
+        self._smtp: Optional[smtplib.SMTP] = None
         
     def add_condition(self, condition: AlertCondition):
         """Add an alert condition to monitor.
@@ -91,7 +135,9 @@ class AlertSystem:
         Args:
             condition: AlertCondition to add
         """
+        condition._owner = self
         self.conditions.append(condition)
+        self._arrays_dirty = True
         logger.info(f"Added alert condition: {condition.level_name} @ ES {condition.es_level:.2f} (threshold: ±{condition.distance_threshold})")
     
     def setup_levels(self, converted_levels: Dict[str, Dict[str, float]]):
@@ -101,6 +147,7 @@ class AlertSystem:
             converted_levels: Dictionary with SPX and ES levels
         """
         self.conditions.clear()
+        self._arrays_dirty = True
         
         for level_name, level_data in converted_levels.items():
             if 'es' in level_data:
@@ -116,7 +163,8 @@ class AlertSystem:
         self,
         current_es_price: float,
         current_volume: Optional[float] = None,
-        velocity: Optional[float] = None
+        velocity: Optional[float] = None,
+        price_source: str = "ES"
     ) -> List[AlertCondition]:
         """Check all conditions and return triggered alerts.
         
@@ -124,27 +172,53 @@ class AlertSystem:
             current_es_price: Current ES price
             current_volume: Current volume (optional)
             velocity: Price velocity (optional)
+            price_source: Where current_es_price comes from, recorded with
+                each alert (e.g. 'ES (derived from SPX + spread)')
             
         Returns:
             List of triggered AlertConditions
         """
+        # Rebuild if conditions were added, cleared, triggered or reset
+        # since the arrays were built
+        if self._arrays_dirty:
+            self._rebuild_condition_arrays()
+            self._arrays_dirty = False
+        
+        # Evaluate every condition at once; AlertCondition.check semantics
+        offset = current_es_price - self._es_levels
+        fire = ~self._triggered & (np.abs(offset) <= self._distance_thresholds)
+        
+        if current_volume is not None:
+            # NaN thresholds (no volume filter) compare False and never block
+            fire &= ~(current_volume < self._volume_thresholds)
+        
+        if velocity is not None:
+            # Price moving away from the level (same sign as offset) is ignored
+            fire &= ~(np.sign(offset) * velocity > 0)
+        
         triggered = []
+        fired = np.flatnonzero(fire)
+        if fired.size == 0:
+            return triggered
         
-        for condition in self.conditions:
-            # Skip already triggered conditions
-            if condition.triggered:
-                continue
-            
-            if condition.check(current_es_price, current_volume, velocity):
-                condition.trigger()
+        # All alerts fired in one check share the same timestamp
+        now = datetime.now()
+        timestamp = now.isoformat()
+        
+        try:
+            for idx in fired:
+                condition = self.conditions[idx]
+                condition.trigger(now)
+                self._triggered[idx] = True
                 triggered.append(condition)
                 
                 # Log alert
                 alert_data = {
-                    'timestamp': condition.trigger_time.isoformat(),
+                    'timestamp': timestamp,
                     'level_name': condition.level_name,
                     'es_level': condition.es_level,
                     'current_price': current_es_price,
+                    'price_source': price_source,
                     'distance': abs(current_es_price - condition.es_level),
                     'volume': current_volume,
                     'velocity': velocity
@@ -153,18 +227,52 @@ class AlertSystem:
                 self.alert_history.append(alert_data)
                 self._log_alert(alert_data)
                 
-                logger.warning(f"🚨 ALERT TRIGGERED: {condition.level_name} at ES {condition.es_level:.2f} (current: {current_es_price:.2f})")
+                logger.warning(f"🚨 ALERT TRIGGERED: {condition.level_name} at ES {condition.es_level:.2f} (current {price_source}: {current_es_price:.2f})")
+        finally:
+            # One flush per check, however many alerts fired in this tick;
+            # lines already buffered are written even if the loop raises
+            self._flush_alert_log()
+        
+        # The trigger() calls above are already reflected in _triggered
+        self._arrays_dirty = False
         
         return triggered
     
+    def _rebuild_condition_arrays(self):
+        """Rebuild the NumPy arrays used by check_all_conditions."""
+        self._es_levels = np.array([c.es_level for c in self.conditions], dtype=np.float64)
+        self._distance_thresholds = np.array([c.distance_threshold for c in self.conditions], dtype=np.float64)
+        self._volume_thresholds = np.array(
+            [np.nan if c.volume_threshold is None else c.volume_threshold for c in self.conditions],
+            dtype=np.float64
+        )
+        self._triggered = np.array([c.triggered for c in self.conditions], dtype=bool)
+    
     def _log_alert(self, alert_data: Dict):
-        """Log alert to file.
+        """Buffer alert for the alert log file.
+        
+        Lines are written through a single long-lived append handle and
+        flushed by _flush_alert_log at the end of each check.
         
         Args:
             alert_data: Alert information dictionary
         """
-        with open(self.alert_log_file, 'a') as f:
-            f.write(json.dumps(alert_data) + '\n')
+        if self._alert_log_handle is None:
+            self._alert_log_handle = open(self.alert_log_file, 'ab', buffering=1 << 16)
+        self._alert_log_handle.write(orjson.dumps(alert_data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE))
+    
+    def _flush_alert_log(self):
+        """Flush buffered alert log lines to disk."""
+        if self._alert_log_handle is not None:
+            self._alert_log_handle.flush()
+    
+    def close(self):
+        """Flush and close the alert log file and channel connections."""
+        if self._alert_log_handle is not None:
+            self._alert_log_handle.close()
+            self._alert_log_handle = None
+        self._close_smtp_connection()
+        self._http.close()
     
     async def send_telegram_alert(self, message: str):
         """Send alert via Telegram.
@@ -177,9 +285,10 @@ class AlertSystem:
             return
         
         try:
-            from telegram import Bot
-            bot = Bot(token=config.telegram_bot_token)
-            await bot.send_message(chat_id=config.telegram_chat_id, text=message)
+            if self._telegram_bot is None:
+                from telegram import Bot
+                self._telegram_bot = Bot(token=config.telegram_bot_token)
+            await self._telegram_bot.send_message(chat_id=config.telegram_chat_id, text=message)
             logger.info("Telegram alert sent")
         except Exception as e:
             logger.error(f"Error sending Telegram alert: {e}")
@@ -195,9 +304,12 @@ class AlertSystem:
             return
         
         try:
-            from discord_webhook import DiscordWebhook
-            webhook = DiscordWebhook(url=config.discord_webhook_url, content=message)
-            webhook.execute()
+            response = self._http.post(
+                config.discord_webhook_url,
+                json={'content': message},
+                timeout=ALERT_SEND_TIMEOUT
+            )
+            response.raise_for_status()
             logger.info("Discord alert sent")
         except Exception as e:
             logger.error(f"Error sending Discord alert: {e}")
@@ -214,7 +326,6 @@ class AlertSystem:
             return
         
         try:
-            import smtplib
             from email.mime.text import MIMEText
             
             msg = MIMEText(body)
@@ -222,53 +333,112 @@ class AlertSystem:
             msg['From'] = config.email_from
             msg['To'] = config.email_to
             
-            with smtplib.SMTP(config.email_smtp_server, config.email_smtp_port) as server:
-                server.starttls()
-                server.login(config.email_from, config.email_password)
-                server.send_message(msg)
+            self._get_smtp_connection().send_message(msg)
             
             logger.info("Email alert sent")
         except Exception as e:
+            self._close_smtp_connection()
             logger.error(f"Error sending email alert: {e}")
     
-    def send_alert(self, condition: AlertCondition, current_price: float):
-        """Send alert through all configured channels.
+    def _get_smtp_connection(self) -> smtplib.SMTP:
+        """Return a logged-in SMTP connection, reconnecting only if it dropped."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp_connection()
+        
+        server = smtplib.SMTP(config.email_smtp_server, config.email_smtp_port, timeout=ALERT_SEND_TIMEOUT)
+        server.starttls()
+        server.login(config.email_from, config.email_password)
+        self._smtp = server
+        return server
+    
+    def _close_smtp_connection(self):
+        """Close the cached SMTP connection, ignoring errors."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._smtp = None
+    
+    def send_alert(self, condition: AlertCondition, current_price: float, price_source: str = "ES"):
+        """Queue alert for delivery through all configured channels.
+        
+        Returns immediately; delivery happens on a background worker.
         
         Args:
             condition: Triggered condition
             current_price: Current ES price
+            price_source: Where current_price comes from, shown in the message
         """
         message = f"""
 🚨 GAMMA LEVEL ALERT 🚨
 
 Level: {condition.level_name.upper()}
 ES Target: ${condition.es_level:.2f}
-Current Price: ${current_price:.2f}
+Current Price ({price_source}): ${current_price:.2f}
 Distance: ${abs(current_price - condition.es_level):.2f}
 
-Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Time: {(condition.trigger_time or datetime.now()).strftime('%Y-%m-%d %H:%M:%S')}
 """
         
-        # Send through available channels
-        self.send_discord_alert(message)
-        
-        # Telegram requires async
+        self._ensure_send_worker()
+        self._send_queue.put((f"Gamma Alert: {condition.level_name}", message))
+    
+    def wait_for_pending_alerts(self):
+        """Block until every queued alert has been handed to its channels."""
+        self._send_queue.join()
+    
+    def _ensure_send_worker(self):
+        """Start the notification worker thread if it is not running."""
+        if self._send_worker is None or not self._send_worker.is_alive():
+            self._send_worker = threading.Thread(
+                target=self._run_send_worker,
+                name="alert-sender",
+                daemon=True
+            )
+            self._send_worker.start()
+    
+    def _run_send_worker(self):
+        """Drain the send queue on a single long-lived event loop."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
         try:
-            asyncio.run(self.send_telegram_alert(message))
-        except Exception as e:
-            logger.error(f"Error sending Telegram alert: {e}")
+            while True:
+                subject, message = self._send_queue.get()
+                try:
+                    loop.run_until_complete(self._deliver_alert(subject, message))
+                except Exception as e:
+                    logger.error(f"Error delivering alert: {e}")
+                finally:
+                    self._send_queue.task_done()
+        finally:
+            loop.close()
+    
+    async def _deliver_alert(self, subject: str, message: str):
+        """Send one alert through all configured channels concurrently.
         
-        # Email
-        self.send_email_alert(
-            subject=f"Gamma Alert: {condition.level_name}",
-            body=message
+        Args:
+            subject: Alert subject (used for email)
+            message: Alert message
+        """
+        await asyncio.gather(
+            self.send_telegram_alert(message),
+            asyncio.to_thread(self.send_discord_alert, message),
+            asyncio.to_thread(self.send_email_alert, subject, message),
+            return_exceptions=True
         )
     
     def reset_conditions(self):
         """Reset all triggered conditions (e.g., at start of new day)."""
         for condition in self.conditions:
-            condition.triggered = False
-            condition.trigger_time = None
+            condition.reset()
+        self._arrays_dirty = True
         
         logger.info("All alert conditions reset")
     
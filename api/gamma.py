@@ -1,19 +1,49 @@
 """Vercel Serverless Function - Calculate gamma levels."""
-from http.server import BaseHTTPRequestHandler
-import json
+import asyncio
+import hashlib
+import os
+import time
 import numpy as np
 import pandas as pd
+import requests
 import yfinance as yf
 from datetime import datetime
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+
+
+# Short-lived, process-local price cache so bursts of requests on a warm
+# instance share one upstream fetch. Entries are (price, monotonic_ts).
+PRICE_TTL_SECONDS = float(os.getenv("PRICE_CACHE_TTL_SECONDS", "10"))
+_PRICE_CACHE = {}
+
+# Tickers are built once per warm instance and share one keep-alive session,
+# so repeated invocations reuse the TCP/TLS connection to Yahoo.
+_SESSION = requests.Session()
+_SPX = yf.Ticker("^GSPC", session=_SESSION)
+_ES = yf.Ticker("ES=F", session=_SESSION)
+
+
+def _cached_price(symbol):
+    """Return the cached price for symbol if still within the TTL."""
+    cached = _PRICE_CACHE.get(symbol)
+    if cached and time.monotonic() - cached[1] < PRICE_TTL_SECONDS:
+        return cached[0]
+    return None
 
 
 def get_spx_price():
     """Get current SPX price."""
+    price = _cached_price("^GSPC")
+    if price is not None:
+        return price
     try:
-        spx = yf.Ticker("^GSPC")
-        data = spx.history(period="1d", interval="1m")
+        data = _SPX.history(period="1d", interval="1m")
         if not data.empty:
-            return float(data['Close'].iloc[-1])
+            price = float(data['Close'].iloc[-1])
+            _PRICE_CACHE["^GSPC"] = (price, time.monotonic())
+            return price
     except:
         pass
     return None
@@ -21,54 +51,108 @@ def get_spx_price():
 
 def get_es_price():
     """Get current ES price."""
+    price = _cached_price("ES=F")
+    if price is not None:
+        return price
     try:
-        es = yf.Ticker("ES=F")
-        es_data = es.history(period="1d", interval="1m")
+        es_data = _ES.history(period="1d", interval="1m")
         if not es_data.empty:
-            return float(es_data['Close'].iloc[-1])
+            price = float(es_data['Close'].iloc[-1])
+            _PRICE_CACHE["ES=F"] = (price, time.monotonic())
+            return price
     except:
         pass
     return None
 
 
+# Memoized calculate_gamma_levels results keyed on (SPX bucket, options
+# fingerprint). Entries are (result, monotonic_ts).
+GAMMA_CACHE_TTL_SECONDS = float(os.getenv("GAMMA_CACHE_TTL_SECONDS", "10"))
+GAMMA_CACHE_MAX_ENTRIES = 32
+_GAMMA_CACHE = {}
+
+
+def _options_fingerprint(df):
+    """Content hash of the option columns that feed the gamma calculation."""
+    hashed = pd.util.hash_pandas_object(
+        df[['strike', 'type', 'open_interest', 'gamma', 'volume']], index=False
+    )
+    return hashlib.blake2b(hashed.to_numpy().tobytes(), digest_size=16).digest()
+
+
 def calculate_gamma_levels(df, spx_price):
+    """Calculate gamma levels, reusing a recent result for identical inputs.
+
+    SPX is bucketed to 0.1 points. Cached results are shared, so callers
+    must not mutate the returned DataFrame.
+    """
+    now = time.monotonic()
+    key = (round(spx_price, 1), _options_fingerprint(df))
+    cached = _GAMMA_CACHE.get(key)
+    if cached and now - cached[1] < GAMMA_CACHE_TTL_SECONDS:
+        return cached[0]
+
+    result = _calculate_gamma_levels(df, spx_price)
+
+    if len(_GAMMA_CACHE) >= GAMMA_CACHE_MAX_ENTRIES:
+        for stale_key in [k for k, (_, ts) in _GAMMA_CACHE.items() if now - ts >= GAMMA_CACHE_TTL_SECONDS]:
+            del _GAMMA_CACHE[stale_key]
+        if len(_GAMMA_CACHE) >= GAMMA_CACHE_MAX_ENTRIES:
+            _GAMMA_CACHE.pop(next(iter(_GAMMA_CACHE)))
+    _GAMMA_CACHE[key] = (result, now)
+    return result
+
+
+def _calculate_gamma_levels(df, spx_price):
     """Calculate gamma levels."""
-    # Calculate dealer gamma
-    df['dealer_gamma'] = -df['open_interest'] * df['gamma'] * 100
-    df['call_gamma'] = df.apply(lambda r: r['dealer_gamma'] if r['type'] == 'call' else 0, axis=1)
-    df['put_gamma'] = df.apply(lambda r: r['dealer_gamma'] if r['type'] == 'put' else 0, axis=1)
+    # Calculate dealer gamma (vectorized, no per-row callbacks)
+    dealer_gamma = -df['open_interest'].to_numpy(dtype=np.float64) * df['gamma'].to_numpy(dtype=np.float64) * 100.0
+    # Series.eq compares categorical codes directly when 'type' is a category,
+    # instead of materializing an object array of Python strings
+    is_call = df['type'].eq('call').to_numpy()
+    is_put = df['type'].eq('put').to_numpy()
+    call_gamma = np.where(is_call, dealer_gamma, 0.0)
+    put_gamma = np.where(is_put, dealer_gamma, 0.0)
     
-    # Aggregate by strike
-    agg_df = df.groupby('strike').agg({
-        'dealer_gamma': 'sum',
-        'call_gamma': 'sum',
-        'put_gamma': 'sum',
-        'volume': 'sum',
-        'open_interest': 'sum'
-    }).reset_index()
+    # Aggregate by strike: one bincount pass per column over factorized strikes
+    codes, strikes = pd.factorize(df['strike'].to_numpy(), sort=True)
+    n_strikes = strikes.size
+    call_by_strike = np.bincount(codes, weights=call_gamma, minlength=n_strikes)
+    put_by_strike = np.bincount(codes, weights=put_gamma, minlength=n_strikes)
+    net_by_strike = call_by_strike + put_by_strike
     
-    agg_df['net_gamma'] = agg_df['call_gamma'] + agg_df['put_gamma']
+    agg_df = pd.DataFrame({
+        'strike': strikes,
+        'dealer_gamma': np.bincount(codes, weights=dealer_gamma, minlength=n_strikes),
+        'call_gamma': call_by_strike,
+        'put_gamma': put_by_strike,
+        'volume': np.bincount(codes, weights=df['volume'].to_numpy(dtype=np.float64), minlength=n_strikes).astype(np.int64),
+        'open_interest': np.bincount(codes, weights=df['open_interest'].to_numpy(dtype=np.float64), minlength=n_strikes).astype(np.int64),
+        'net_gamma': net_by_strike,
+    })
     
-    # Find key levels
+    # Find key levels. Strikes are sorted (factorize(sort=True)), so each
+    # price window is a contiguous slice located by binary search.
     levels = {}
     
-    # Put Wall
-    put_strikes = agg_df[agg_df['strike'] <= spx_price]
-    if not put_strikes.empty:
-        put_wall_idx = put_strikes['put_gamma'].abs().idxmax()
-        levels['put_wall'] = float(put_strikes.loc[put_wall_idx, 'strike'])
+    # Put Wall: strikes <= spx_price
+    put_end = np.searchsorted(strikes, spx_price, side='right')
+    if put_end > 0:
+        put_wall_idx = int(np.argmax(np.abs(put_by_strike[:put_end])))
+        levels['put_wall'] = float(strikes[put_wall_idx])
     
-    # Call Wall
-    call_strikes = agg_df[agg_df['strike'] >= spx_price]
-    if not call_strikes.empty:
-        call_wall_idx = call_strikes['call_gamma'].abs().idxmax()
-        levels['call_wall'] = float(call_strikes.loc[call_wall_idx, 'strike'])
+    # Call Wall: strikes >= spx_price
+    call_start = np.searchsorted(strikes, spx_price, side='left')
+    if call_start < n_strikes:
+        call_wall_idx = call_start + int(np.argmax(np.abs(call_by_strike[call_start:])))
+        levels['call_wall'] = float(strikes[call_wall_idx])
     
-    # Gamma Flip
-    near_price = agg_df[(agg_df['strike'] >= spx_price * 0.99) & (agg_df['strike'] <= spx_price * 1.01)]
-    if not near_price.empty:
-        gamma_flip_idx = near_price['net_gamma'].abs().idxmin()
-        levels['gamma_flip'] = float(near_price.loc[gamma_flip_idx, 'strike'])
+    # Gamma Flip: strikes within ±1% of spx_price
+    near_start = np.searchsorted(strikes, spx_price * 0.99, side='left')
+    near_end = np.searchsorted(strikes, spx_price * 1.01, side='right')
+    if near_end > near_start:
+        gamma_flip_idx = near_start + int(np.argmin(np.abs(net_by_strike[near_start:near_end])))
+        levels['gamma_flip'] = float(strikes[gamma_flip_idx])
     
     # Determine regime
     regime = "short_gamma" if spx_price > levels.get('gamma_flip', spx_price) else "long_gamma"
@@ -76,76 +160,75 @@ def calculate_gamma_levels(df, spx_price):
     return levels, regime, agg_df
 
 
-class handler(BaseHTTPRequestHandler):
-    """Vercel serverless function handler."""
-    
-    def do_GET(self):
-        """Handle GET request."""
-        try:
-            # Get SPX price
-            spx_price = get_spx_price()
-            es_price = get_es_price()
-
-            if spx_price is None or es_price is None:
-                response = {
-                    'success': False,
-                    'error': 'No data available'
-                }
-                self.send_response(503)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(response).encode())
-                return
-            
-            spread = es_price - spx_price
-
-            # No mock options generation in production API
+def build_gamma_profile(agg_df, limit=50):
+    """Build JSON-ready profile rows for the first `limit` strikes.
+
+    agg_df is already sorted by strike, so only the rows that are sent are
+    converted, straight from the NumPy columns.
+    """
+    head = agg_df.iloc[:limit]
+    columns = {name: head[name].to_numpy().tolist() for name in head.columns}
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+async def fetch_prices():
+    """Fetch SPX and ES prices concurrently (latency is max, not sum)."""
+    return await asyncio.gather(
+        asyncio.to_thread(get_spx_price),
+        asyncio.to_thread(get_es_price)
+    )
+
+
+app = FastAPI(default_response_class=ORJSONResponse)
+app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["GET"])
+
+
+@app.get("/api/gamma")
+async def gamma():
+    """Handle GET /api/gamma."""
+    try:
+        # Get SPX and ES prices
+        spx_price, es_price = await fetch_prices()
+
+        if spx_price is None or es_price is None:
             response = {
                 'success': False,
-                'error': 'No options data available'
+                'error': 'No data available'
             }
-            self.send_response(503)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
-            return
-            
-            # Convert to ES
-            es_levels = {k: v + spread for k, v in levels.items()}
-            
-            # Get gamma profile for chart
-            chart_data = agg_df.sort_values('strike').to_dict('records')
-            
-            response = {
-                'success': True,
-                'data': {
-                    'spx_price': spx_price,
-                    'es_price': es_price,
-                    'spread': spread,
-                    'regime': regime,
-                    'levels_spx': levels,
-                    'levels_es': es_levels,
-                    'gamma_profile': chart_data[:50],  # Limit data
-                    'timestamp': datetime.now().isoformat()
-                }
-            }
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
-            
-        except Exception as e:
-            error_response = {
-                'success': False,
-                'error': str(e)
+            return ORJSONResponse(response, status_code=503)
+        
+        spread = es_price - spx_price
+
+        # No mock options generation in production API
+        response = {
+            'success': False,
+            'error': 'No options data available'
+        }
+        return ORJSONResponse(response, status_code=503)
+        
+        # Convert to ES
+        es_levels = {k: v + spread for k, v in levels.items()}
+        
+        # Get gamma profile for chart
+        chart_data = build_gamma_profile(agg_df, limit=50)
+        
+        return {
+            'success': True,
+            'data': {
+                'spx_price': spx_price,
+                'es_price': es_price,
+                'spread': spread,
+                'regime': regime,
+                'levels_spx': levels,
+                'levels_es': es_levels,
+                'gamma_profile': chart_data,
+                'timestamp': datetime.now().isoformat()
             }
-            
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(error_response).encode())
+        }
+        
+    except Exception as e:
+        error_response = {
+            'success': False,
+            'error': str(e)
+        }
+        return ORJSONResponse(error_response, status_code=500)
@@ -1,17 +1,46 @@
 """Vercel Serverless Function - Get SPX and ES prices."""
-from http.server import BaseHTTPRequestHandler
-import json
+import asyncio
+import os
+import time
+import requests
 import yfinance as yf
 from datetime import datetime
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+
+
+# Short-lived, process-local price cache so bursts of requests on a warm
+# instance share one upstream fetch. Entries are (price, monotonic_ts).
+PRICE_TTL_SECONDS = float(os.getenv("PRICE_CACHE_TTL_SECONDS", "10"))
+_PRICE_CACHE = {}
+
+# Tickers are built once per warm instance and share one keep-alive session,
+# so repeated invocations reuse the TCP/TLS connection to Yahoo.
+_SESSION = requests.Session()
+_SPX = yf.Ticker("^GSPC", session=_SESSION)
+_ES = yf.Ticker("ES=F", session=_SESSION)
+
+
+def _cached_price(symbol):
+    """Return the cached price for symbol if still within the TTL."""
+    cached = _PRICE_CACHE.get(symbol)
+    if cached and time.monotonic() - cached[1] < PRICE_TTL_SECONDS:
+        return cached[0]
+    return None
 
 
 def get_spx_price():
     """Get current SPX price from yfinance."""
+    price = _cached_price("^GSPC")
+    if price is not None:
+        return price
     try:
-        spx = yf.Ticker("^GSPC")
-        data = spx.history(period="1d", interval="1m")
+        data = _SPX.history(period="1d", interval="1m")
         if not data.empty:
-            return float(data['Close'].iloc[-1])
+            price = float(data['Close'].iloc[-1])
+            _PRICE_CACHE["^GSPC"] = (price, time.monotonic())
+            return price
     except:
         pass
     return None
@@ -19,53 +48,55 @@ def get_spx_price():
 
 def get_es_price():
     """Get current ES price from yfinance."""
+    price = _cached_price("ES=F")
+    if price is not None:
+        return price
     try:
-        es = yf.Ticker("ES=F")
-        data = es.history(period="1d", interval="1m")
+        data = _ES.history(period="1d", interval="1m")
         if not data.empty:
-            return float(data['Close'].iloc[-1])
+            price = float(data['Close'].iloc[-1])
+            _PRICE_CACHE["ES=F"] = (price, time.monotonic())
+            return price
     except:
         pass
     return None
 
 
-class handler(BaseHTTPRequestHandler):
-    """Vercel serverless function handler."""
-    
-    def do_GET(self):
-        """Handle GET request."""
-        try:
-            spx_price = get_spx_price()
-            es_price = get_es_price()
-            
-            spread = None
-            if spx_price and es_price:
-                spread = es_price - spx_price
-            
-            response = {
-                'success': True,
-                'data': {
-                    'spx': spx_price,
-                    'es': es_price,
-                    'spread': spread,
-                    'timestamp': datetime.now().isoformat()
-                }
-            }
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
-            
-        except Exception as e:
-            error_response = {
-                'success': False,
-                'error': str(e)
+async def fetch_prices():
+    """Fetch SPX and ES prices concurrently (latency is max, not sum)."""
+    return await asyncio.gather(
+        asyncio.to_thread(get_spx_price),
+        asyncio.to_thread(get_es_price)
+    )
+
+
+app = FastAPI(default_response_class=ORJSONResponse)
+app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["GET"])
+
+
+@app.get("/api/prices")
+async def prices():
+    """Handle GET /api/prices."""
+    try:
+        spx_price, es_price = await fetch_prices()
+        
+        spread = None
+        if spx_price and es_price:
+            spread = es_price - spx_price
+        
+        return {
+            'success': True,
+            'data': {
+                'spx': spx_price,
+                'es': es_price,
+                'spread': spread,
+                'timestamp': datetime.now().isoformat()
             }
-            
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(error_response).encode())
+        }
+        
+    except Exception as e:
+        error_response = {
+            'success': False,
+            'error': str(e)
+        }
+        return ORJSONResponse(error_response, status_code=500)
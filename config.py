@@ -2,14 +2,21 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
 # Load environment variables
 load_dotenv()
 
+
 class Config(BaseModel):
-    """Application configuration."""
+    """Application configuration.
+    
+    Values are read from the environment once, at construction; the model
+    is frozen so the module-level instance can be shared safely.
+    """
+    
+    model_config = ConfigDict(frozen=True)
     
     # API Keys
     polygon_api_key: str = Field(default_factory=lambda: os.getenv("POLYGON_API_KEY", ""))
@@ -36,6 +43,13 @@ class Config(BaseModel):
     top_levels_count: int = Field(default_factory=lambda: int(os.getenv("TOP_LEVELS_COUNT", "5")))
     alert_distance_threshold: float = Field(default_factory=lambda: float(os.getenv("ALERT_DISTANCE_THRESHOLD", "0.5")))
     
+    # Seconds a fetched SPX/ES price is reused before hitting the network again
+    price_cache_ttl_seconds: float = Field(default_factory=lambda: float(os.getenv("PRICE_CACHE_TTL_SECONDS", "10")))
+    
+    # Polygon fetch tuning
+    polygon_max_workers: int = Field(default_factory=lambda: int(os.getenv("POLYGON_MAX_WORKERS", "16")))
+    polygon_max_requests_per_second: float = Field(default_factory=lambda: float(os.getenv("POLYGON_MAX_REQUESTS_PER_SECOND", "0")))
+    
     # Timezone
     timezone: str = Field(default_factory=lambda: os.getenv("TIMEZONE", "Europe/Rome"))
     
@@ -46,8 +60,8 @@ class Config(BaseModel):
     def __init__(self, **data):
         super().__init__(**data)
         # Create directories if they don't exist
-        self.data_dir.mkdir(exist_ok=True)
-        self.logs_dir.mkdir(exist_ok=True)
+        for directory in (self.data_dir, self.logs_dir):
+            directory.mkdir(parents=True, exist_ok=True)
 
 # Global config instance
 config = Config()
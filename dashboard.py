@@ -1,20 +1,25 @@
 """Streamlit dashboard for real-time ES level monitoring."""
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime, date
 import json
 from pathlib import Path
-import time
 from config import config
 from data_fetcher import DataFetcher
 from gamma_engine import GammaEngine
 from es_converter import SPXtoESConverter
 from alert_system import AlertSystem
+from price_stream import PublishedPriceStream
 from loguru import logger
 
 
+# Above this many levels the chart coalesces nearby levels into buckets
+MAX_CHART_LEVELS = 64
+
+
 # Page configuration
 st.set_page_config(
     page_title="Gamma Option Dashboard",
@@ -62,29 +67,129 @@ def initialize_components():
         'fetcher': DataFetcher(),
         'engine': GammaEngine(),
         'converter': SPXtoESConverter(),
-        'alerts': AlertSystem()
+        'alerts': AlertSystem(),
+        # Streamed SPX published by the scheduler, which owns the one
+        # WebSocket Polygon allows per API key
+        'stream': PublishedPriceStream()
     }
 
 
+@st.cache_data(show_spinner=False)
+def _load_levels_file(path_str, mtime):
+    """Parse a levels file (cached until its mtime changes).
+    
+    Args:
+        path_str: Levels file path
+        mtime: File modification time (cache key only)
+    """
+    with open(path_str, 'r') as f:
+        return json.load(f)
+
+
 def load_latest_data():
     """Load the latest calculated data from files."""
     data_dir = Path(config.data_dir)
     
-    # Try to load cached levels
+    # Try to load cached levels; only re-parsed when the engine rewrites it
     levels_file = data_dir / "latest_levels.json"
     if levels_file.exists():
-        with open(levels_file, 'r') as f:
-            return json.load(f)
+        return _load_levels_file(str(levels_file), levels_file.stat().st_mtime)
     
     return None
 
 
-def create_level_chart(es_price, converted_levels, regime):
+def tail_jsonl(path, n=5, block_size=8192):
+    """Read the last n records of a JSONL file without scanning all of it.
+    
+    Args:
+        path: JSONL file path
+        n: Number of trailing records to return
+        block_size: Bytes read per backwards step
+        
+    Returns:
+        List of up to n parsed records, oldest first
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, 2)
+        pos = f.tell()
+        data = b''
+        # Need n+1 newlines so the first kept line is complete
+        while pos > 0 and data.count(b'\n') <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    
+    lines = [line for line in data.splitlines() if line.strip()]
+    return [json.loads(line) for line in lines[-n:]]
+
+
+@st.cache_data(ttl=5)
+def load_recent_alerts(path_str, mtime, n=5):
+    """Load the most recent alerts (cached until the log file changes).
+    
+    Args:
+        path_str: Alert log path
+        mtime: Log modification time (cache key only)
+        n: Number of alerts to return
+    """
+    return tail_jsonl(path_str, n)
+
+
+def chart_levels_key(converted_levels):
+    """Hashable (name, es_level) key for create_level_chart's cache."""
+    return tuple(sorted(
+        (level_name, level_data['es'])
+        for level_name, level_data in converted_levels.items()
+        if 'es' in level_data
+    ))
+
+
+def coalesce_levels(levels, names, colors, max_levels):
+    """Merge nearby levels into at most max_levels evenly spaced price buckets.
+    
+    Every non-empty bucket becomes one line at the bucket's mean level, so the
+    number of shapes and annotations stays bounded however many levels exist.
+    
+    Args:
+        levels: ES levels
+        names: Display names (same order)
+        colors: Line colors (same order)
+        max_levels: Number of buckets
+        
+    Returns:
+        (levels, names, colors) for the coalesced lines
+    """
+    values = np.asarray(levels, dtype=np.float64)
+    edges = np.linspace(values.min(), values.max(), max_levels + 1)
+    bucket = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, max_levels - 1)
+    
+    counts = np.bincount(bucket, minlength=max_levels)
+    means = np.bincount(bucket, weights=values, minlength=max_levels)[counts > 0] / counts[counts > 0]
+    
+    out_names = []
+    out_colors = []
+    for b in np.flatnonzero(counts):
+        members = np.flatnonzero(bucket == b)
+        if members.size == 1:
+            out_names.append(names[members[0]])
+        else:
+            out_names.append(f"{members.size} levels")
+        member_colors = {colors[i] for i in members}
+        out_colors.append(member_colors.pop() if len(member_colors) == 1 else 'gray')
+    
+    return means.tolist(), out_names, out_colors
+
+
+@st.cache_data(ttl=30, max_entries=32)
+def create_level_chart(es_price, levels_key, regime):
     """Create interactive chart with ES price and gamma levels.
     
+    Cached, so reruns with an unchanged price and levels reuse the figure.
+    
     Args:
         es_price: Current ES price
-        converted_levels: Dictionary with converted levels
+        levels_key: (level_name, es_level) tuples from chart_levels_key
         regime: Market regime
     """
     fig = go.Figure()
@@ -94,37 +199,39 @@ def create_level_chart(es_price, converted_levels, regime):
     names = []
     colors = []
     
-    for level_name, level_data in converted_levels.items():
-        if 'es' in level_data:
-            levels.append(level_data['es'])
-            names.append(level_name.replace('_', ' ').title())
-            
-            # Color coding
-            if 'put' in level_name.lower():
-                colors.append('green')
-            elif 'call' in level_name.lower():
-                colors.append('red')
-            else:
-                colors.append('blue')
-    
-    # Add horizontal lines for each level
-    for level, name, color in zip(levels, names, colors):
-        fig.add_hline(
-            y=level,
-            line_dash="dash",
-            line_color=color,
-            annotation_text=f"{name}: ${level:.2f}",
-            annotation_position="right"
-        )
+    for level_name, es_level in levels_key:
+        levels.append(es_level)
+        names.append(level_name.replace('_', ' ').title())
+        
+        # Color coding
+        if 'put' in level_name.lower():
+            colors.append('green')
+        elif 'call' in level_name.lower():
+            colors.append('red')
+        else:
+            colors.append('blue')
+    
+    if len(levels) > MAX_CHART_LEVELS:
+        levels, names, colors = coalesce_levels(levels, names, colors, MAX_CHART_LEVELS)
+    
+    # Horizontal lines for each level plus the current price, built once and
+    # applied in a single layout update (no per-line add_hline round-trips)
+    shapes = [
+        dict(type='line', xref='paper', x0=0, x1=1, y0=level, y1=level,
+             line=dict(color=color, dash='dash'))
+        for level, color in zip(levels, colors)
+    ]
+    annotations = [
+        dict(xref='paper', x=1, y=level, xanchor='right', yanchor='bottom',
+             text=f"{name}: ${level:.2f}", showarrow=False)
+        for level, name in zip(levels, names)
+    ]
     
     # Add current price
-    fig.add_hline(
-        y=es_price,
-        line_width=3,
-        line_color="black",
-        annotation_text=f"ES: ${es_price:.2f}",
-        annotation_position="left"
-    )
+    shapes.append(dict(type='line', xref='paper', x0=0, x1=1, y0=es_price, y1=es_price,
+                       line=dict(color='black', width=3)))
+    annotations.append(dict(xref='paper', x=0, y=es_price, xanchor='left', yanchor='bottom',
+                            text=f"ES: ${es_price:.2f}", showarrow=False))
     
     # Update layout
     fig.update_layout(
@@ -132,54 +239,41 @@ def create_level_chart(es_price, converted_levels, regime):
         yaxis_title="ES Price",
         height=600,
         showlegend=False,
-        hovermode='y'
+        hovermode='y',
+        # Explicit template, rendered with theme=None (no Streamlit theme merge)
+        template='plotly_white',
+        shapes=shapes,
+        annotations=annotations,
+        # Keep zoom/pan across fragment reruns
+        uirevision='gamma-levels'
     )
     
     return fig
 
 
-def main():
-    """Main dashboard function."""
+def prices_panel(fetcher, converter, stream, cadence_live=None):
+    """Render the SPX / ES / spread metrics row.
     
-    # Title
-    st.title("📊 Gamma Option Dashboard")
-    st.markdown("### ES Future Levels Based on SPX 0DTE Gamma Exposure")
-    
-    # Initialize components
-    components = initialize_components()
-    fetcher = components['fetcher']
-    converter = components['converter']
+    Args:
+        fetcher: DataFetcher for REST prices
+        converter: SPXtoESConverter holding the daily spread
+        stream: PublishedPriceStream with the scheduler's streamed SPX value
+        cadence_live: Stream state the fragment's refresh interval was
+            chosen for, or None when auto-refresh is off
+    """
+    # The run_every interval is fixed when the page runs; when the stream
+    # goes live or drops, rerun the page so the cadence follows it
+    if cadence_live is not None and stream.is_live() != cadence_live:
+        st.rerun()
     
-    # Sidebar
-    with st.sidebar:
-        st.header("⚙️ Settings")
-        
-        # Refresh button
-        if st.button("🔄 Refresh Data", use_container_width=True):
-            st.cache_resource.clear()
-            st.rerun()
-        
-        st.divider()
-        
-        # Configuration display
-        st.subheader("Configuration")
-        st.text(f"Strike Range: ±{config.strike_range_percent}%")
-        st.text(f"Min Volume: {config.min_volume_threshold}")
-        st.text(f"Alert Threshold: ±{config.alert_distance_threshold} pts")
-        
-        st.divider()
-        
-        # Auto-refresh
-        auto_refresh = st.checkbox("Auto-refresh (30s)", value=False)
-        
-    # Main content
     try:
         # Get current prices
         col1, col2, col3 = st.columns(3)
         
         with col1:
             with st.spinner("Fetching SPX price..."):
-                spx_price = fetcher.get_spx_price()
+                # Streamed value when fresh, REST (TTL-cached) otherwise
+                spx_price = stream.get_spx_price() or fetcher.get_spx_price()
                 if spx_price:
                     st.metric("SPX Price", f"${spx_price:.2f}")
                 else:
@@ -195,44 +289,83 @@ def main():
         
         with col3:
             if spx_price and es_price:
+                # Today's fixed spread if the batch job stored one, otherwise the
+                # live one; the dashboard never writes the spread cache
                 spread = converter.get_spread()
                 if spread is None:
                     spread = es_price - spx_price
-                    converter.calculate_spread(spx_price, es_price)
                 
                 st.metric("ES-SPX Spread", f"{spread:+.2f}")
+    
+    except Exception as e:
+        st.error(f"Error: {str(e)}")
+        logger.error(f"Dashboard error: {e}")
+
+
+def levels_panel(fetcher):
+    """Render regime, key levels and the level chart."""
+    try:
+        # Load latest data (re-read on every fragment run)
+        latest_data = load_latest_data()
+        
+        if not latest_data:
+            st.warning("⚠️ No data available. Run the main application to fetch and calculate levels.")
+            
+            if st.button("Run Data Fetch Now"):
+                with st.spinner("Fetching data and calculating levels..."):
+                    st.info("Please run: python main.py")
+            return
+        
+        converted_levels = latest_data.get('converted_levels', {})
+        regime = latest_data.get('regime', 'unknown')
+        # Served from the fetcher's short-TTL price cache
+        es_price = fetcher.get_es_price()
+        
+        # Display regime
+        col1, col2 = st.columns([2, 1])
+        
+        with col1:
+            st.subheader("Market Regime")
+            if regime == "long_gamma":
+                st.success("🟢 LONG GAMMA - Expect mean reversion, lower volatility")
+            elif regime == "short_gamma":
+                st.error("🔴 SHORT GAMMA - Expect higher volatility, trending moves")
+            else:
+                st.info("⚪ NEUTRAL")
+        
+        with col2:
+            st.subheader("Last Update")
+            update_time = latest_data.get('timestamp', 'Unknown')
+            st.text(update_time)
         
         st.divider()
         
-        # Load latest data
-        latest_data = load_latest_data()
+        # Key levels
+        st.subheader("🎯 Key Gamma Levels")
         
-        if latest_data:
-            converted_levels = latest_data.get('converted_levels', {})
-            regime = latest_data.get('regime', 'unknown')
-            
-            # Display regime
-            col1, col2 = st.columns([2, 1])
-            
-            with col1:
-                st.subheader("Market Regime")
-                if regime == "long_gamma":
-                    st.success("🟢 LONG GAMMA - Expect mean reversion, lower volatility")
-                elif regime == "short_gamma":
-                    st.error("🔴 SHORT GAMMA - Expect higher volatility, trending moves")
-                else:
-                    st.info("⚪ NEUTRAL")
-            
-            with col2:
-                st.subheader("Last Update")
-                update_time = latest_data.get('timestamp', 'Unknown')
-                st.text(update_time)
-            
-            st.divider()
-            
-            # Key levels
-            st.subheader("🎯 Key Gamma Levels")
-            
+        # One table widget instead of a metric column per level
+        levels_table = pd.DataFrame([
+            {
+                'Level': level_name.replace('_', ' ').title(),
+                'ES': level_data['es'],
+                'SPX': level_data['spx'],
+                'Distance': es_price - level_data['es'] if es_price else np.nan,
+            }
+            for level_name, level_data in converted_levels.items()
+        ])
+        st.dataframe(
+            levels_table,
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'ES': st.column_config.NumberColumn(format="$%.2f"),
+                'SPX': st.column_config.NumberColumn(format="$%.2f"),
+                'Distance': st.column_config.NumberColumn(format="%+.2f"),
+            }
+        )
+        
+        # Per-level cards only when asked for (widgets are built only if on)
+        if converted_levels and st.toggle("Show level cards", value=False):
             cols = st.columns(len(converted_levels))
             
             for idx, (level_name, level_data) in enumerate(converted_levels.items()):
@@ -248,58 +381,102 @@ def main():
                     if es_price:
                         distance = es_price - level_data['es']
                         st.text(f"Distance: {distance:+.2f}")
+        
+        st.divider()
+        
+        # Chart
+        if es_price:
+            st.subheader("📈 ES Price vs Gamma Levels")
+            chart = create_level_chart(es_price, chart_levels_key(converted_levels), regime)
+            st.plotly_chart(chart, use_container_width=True, theme=None)
+    
+    except Exception as e:
+        st.error(f"Error: {str(e)}")
+        logger.error(f"Dashboard error: {e}")
+
+
+def alerts_panel():
+    """Render the most recent alerts."""
+    try:
+        st.subheader("🚨 Recent Alerts")
+        
+        alert_log_file = config.logs_dir / "alerts.jsonl"
+        if alert_log_file.exists():
+            # Read only the last 5 alerts from the end of the log
+            alerts = load_recent_alerts(str(alert_log_file), alert_log_file.stat().st_mtime, 5)
             
-            st.divider()
-            
-            # Chart
-            if es_price:
-                st.subheader("📈 ES Price vs Gamma Levels")
-                chart = create_level_chart(es_price, converted_levels, regime)
-                st.plotly_chart(chart, use_container_width=True)
-            
-            st.divider()
-            
-            # Alerts section
-            st.subheader("🚨 Recent Alerts")
-            
-            alert_log_file = config.logs_dir / "alerts.jsonl"
-            if alert_log_file.exists():
-                # Read last 10 alerts
-                alerts = []
-                with open(alert_log_file, 'r') as f:
-                    for line in f:
-                        alerts.append(json.loads(line))
-                
-                if alerts:
-                    # Display most recent alerts
-                    for alert in alerts[-5:]:
-                        st.markdown(f"""
-                        <div class="alert-box">
-                        🚨 {alert['level_name'].upper()} @ ${alert['es_level']:.2f}<br>
-                        Current: ${alert['current_price']:.2f} | Distance: ${alert['distance']:.2f}<br>
-                        {alert['timestamp']}
-                        </div>
-                        """, unsafe_allow_html=True)
-                else:
-                    st.info("No alerts triggered yet today")
+            if alerts:
+                # Display most recent alerts
+                for alert in alerts:
+                    st.markdown(f"""
+                    <div class="alert-box">
+                    🚨 {alert['level_name'].upper()} @ ${alert['es_level']:.2f}<br>
+                    Current ({alert.get('price_source', 'ES')}): ${alert['current_price']:.2f} | Distance: ${alert['distance']:.2f}<br>
+                    {alert['timestamp']}
+                    </div>
+                    """, unsafe_allow_html=True)
             else:
                 st.info("No alerts triggered yet today")
-            
         else:
-            st.warning("⚠️ No data available. Run the main application to fetch and calculate levels.")
-            
-            if st.button("Run Data Fetch Now"):
-                with st.spinner("Fetching data and calculating levels..."):
-                    st.info("Please run: python main.py")
-        
+            st.info("No alerts triggered yet today")
+    
     except Exception as e:
         st.error(f"Error: {str(e)}")
         logger.error(f"Dashboard error: {e}")
+
+
+def main():
+    """Main dashboard function."""
     
-    # Auto-refresh
-    if auto_refresh:
-        time.sleep(30)
-        st.rerun()
+    # Title
+    st.title("📊 Gamma Option Dashboard")
+    st.markdown("### ES Future Levels Based on SPX 0DTE Gamma Exposure")
+    
+    # Initialize components
+    components = initialize_components()
+    fetcher = components['fetcher']
+    converter = components['converter']
+    stream = components['stream']
+    
+    # Sidebar
+    with st.sidebar:
+        st.header("⚙️ Settings")
+        
+        # Refresh button (components stay cached; only data caches are dropped)
+        if st.button("🔄 Refresh Data", use_container_width=True):
+            st.cache_data.clear()
+            st.rerun()
+        
+        st.divider()
+        
+        # Configuration display
+        st.subheader("Configuration")
+        st.text(f"Strike Range: ±{config.strike_range_percent}%")
+        st.text(f"Min Volume: {config.min_volume_threshold}")
+        st.text(f"Alert Threshold: ±{config.alert_distance_threshold} pts")
+        
+        st.divider()
+        
+        # Auto-refresh
+        auto_refresh = st.checkbox("Auto-refresh (30s)", value=False)
+    
+    # Each panel is a fragment: auto-refresh reruns only the panels,
+    # not the whole script
+    run_every = 30 if auto_refresh else None
+    # While the scheduler publishes streamed SPX, the price row redraws every second
+    live = stream.is_live() if auto_refresh else None
+    prices_every = (1 if live else 30) if auto_refresh else None
+    
+    # Main content
+    st.fragment(run_every=prices_every)(prices_panel)(fetcher, converter, stream, live)
+    
+    st.divider()
+    
+    st.fragment(run_every=run_every)(levels_panel)(fetcher)
+    
+    st.divider()
+    
+    st.fragment(run_every=run_every)(alerts_panel)()
 
 
 if __name__ == "__main__":
@@ -1,16 +1,72 @@
 """Data fetching module for SPX options and price data with multiple data sources."""
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
+import json
 import pandas as pd
 from loguru import logger
 from polygon import RESTClient
 import yfinance as yf
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import threading
+import time
+from pathlib import Path
 from urllib.parse import quote
 from config import config
 
 
+# Compact column dtypes for options DataFrames. Strikes stay float64 because
+# they become level prices that are JSON-serialized and type-checked as float.
+OPTIONS_DTYPES = {
+    'ticker': 'string[pyarrow]',
+    'type': 'category',
+    'expiration': 'string[pyarrow]',
+    'volume': 'int32',
+    'open_interest': 'int32',
+    'implied_volatility': 'float32',
+    'delta': 'float32',
+    'gamma': 'float32',
+    'theta': 'float32',
+    'vega': 'float32',
+}
+
+
+def apply_options_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast an options DataFrame to OPTIONS_DTYPES (columns present only).
+    
+    Args:
+        df: Options DataFrame
+        
+    Returns:
+        DataFrame with compact dtypes
+    """
+    return df.astype({col: dtype for col, dtype in OPTIONS_DTYPES.items() if col in df.columns})
+
+
+# Seconds the SPX price used to center mock strikes is reused
+MOCK_ANCHOR_TTL_SECONDS = 60
+
+
+@lru_cache(maxsize=1)
+def _rest_client() -> Optional[RESTClient]:
+    """Process-wide Polygon client (one connection pool for all fetchers)."""
+    return RESTClient(config.polygon_api_key) if config.polygon_api_key else None
+
+
+@lru_cache(maxsize=8)
+def _yf_ticker(symbol: str) -> yf.Ticker:
+    """Process-wide yfinance Ticker per symbol.
+    
+    A reused Ticker remembers the expiration list, so option_chain(date)
+    skips the extra expirations request a fresh Ticker makes first.
+    """
+    return yf.Ticker(symbol)
+
+
 class DataFetcher:
     """Fetch SPX options and price data from multiple sources."""
     
@@ -19,7 +75,7 @@ class DataFetcher:
         self.use_polygon = bool(config.polygon_api_key)
         if self.use_polygon:
             try:
-                self.client = RESTClient(config.polygon_api_key)
+                self.client = _rest_client()
                 logger.info("Polygon API initialized")
             except Exception as e:
                 logger.warning(f"Polygon initialization failed: {e}")
@@ -28,6 +84,29 @@ class DataFetcher:
         else:
             logger.warning("No Polygon API key - using free data sources only")
             self.client = None
+        
+        # Keep-alive session for direct Yahoo requests; transient 429/5xx are
+        # retried with backoff on the same pooled connection
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+            raise_on_status=False
+        )
+        self._http = requests.Session()
+        self._http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry))
+        
+        # Yahoo expiration list for the day: (date, symbol, expirations)
+        self._expirations_cache = None
+        self.expirations_cache_file = config.data_dir / "yfinance_expirations.json"
+        
+        # Short-TTL price cache: symbol -> (price, monotonic_ts)
+        self._price_cache = {}
+        
+        # Simple rate limiter for the per-contract Polygon fallback
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
 
     def _get_yahoo_chart_price(self, symbol: str) -> Optional[float]:
         """Fetch latest price using Yahoo Finance chart endpoint (no yfinance).
@@ -37,9 +116,9 @@ class DataFetcher:
         """
         try:
             url = f"https://query1.finance.yahoo.com/v8/finance/chart/{quote(symbol, safe='')}?interval=1d&range=1d"
-            response = requests.get(
+            response = self._http.get(
                 url,
-                timeout=10,
+                timeout=(3, 7),  # (connect, read): fail fast on dead sockets
                 headers={
                     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
                     "Accept": "application/json",
@@ -71,8 +150,74 @@ class DataFetcher:
             logger.warning(f"Yahoo chart fetch failed for {symbol}: {e}")
             return None
         
+    def _get_yfinance_last_price(self, symbol: str) -> Optional[float]:
+        """Latest price from yfinance's quote data, falling back to 1m history.
+        
+        fast_info returns one scalar instead of a day of 1-minute bars.
+        
+        Args:
+            symbol: Yahoo symbol
+            
+        Returns:
+            Latest price or None if unavailable
+        """
+        ticker = _yf_ticker(symbol)
+        # The Ticker (and its HTTP session) is reused, but fast_info memoizes
+        # last_price on first access; drop it so each call refetches the quote
+        ticker._fast_info = None
+        try:
+            price = ticker.fast_info['last_price']
+            if price is not None and np.isfinite(price):
+                return float(price)
+        except Exception as e:
+            logger.debug(f"yfinance fast_info failed for {symbol}: {e}")
+        
+        data = ticker.history(period="1d", interval="1m")
+        if not data.empty:
+            return float(data['Close'].iloc[-1])
+        return None
+    
+    def _cached_price(self, symbol: str, fetch, ttl: Optional[float] = None) -> Optional[float]:
+        """Return a recent price for symbol, calling fetch() once the TTL lapses.
+        
+        Args:
+            symbol: Cache key
+            fetch: Callable returning the fresh price (or None)
+            ttl: Cache lifetime in seconds (default: config.price_cache_ttl_seconds)
+            
+        Returns:
+            Price or None if fetch fails
+        """
+        if ttl is None:
+            ttl = config.price_cache_ttl_seconds
+        cached = self._price_cache.get(symbol)
+        now = time.monotonic()
+        if cached and now - cached[1] < ttl:
+            return cached[0]
+        
+        price = fetch()
+        if price is not None:
+            self._price_cache[symbol] = (price, now)
+        return price
+    
     def get_spx_price(self) -> Optional[float]:
-        """Get current SPX cash price.
+        """Get current SPX cash price (cached for price_cache_ttl_seconds).
+        
+        Returns:
+            Current SPX price or None if fetch fails
+        """
+        return self._cached_price("SPX", self._fetch_spx_price)
+    
+    def get_es_price(self) -> Optional[float]:
+        """Get current ES future price (cached for price_cache_ttl_seconds).
+        
+        Returns:
+            Current ES price or None if fetch fails
+        """
+        return self._cached_price("ES", self._fetch_es_price)
+    
+    def _fetch_spx_price(self) -> Optional[float]:
+        """Fetch current SPX cash price.
         
         Returns:
             Current SPX price or None if fetch fails
@@ -93,11 +238,9 @@ class DataFetcher:
         # Fallback to yfinance (free)
         try:
             logger.info("Using yfinance as fallback for SPX price...")
-            spx = yf.Ticker("^GSPC")  # S&P 500 Index
-            data = spx.history(period="1d", interval="1m")
+            price = self._get_yfinance_last_price("^GSPC")  # S&P 500 Index
             
-            if not data.empty:
-                price = float(data['Close'].iloc[-1])
+            if price is not None:
                 logger.info(f"SPX current price (yfinance): {price}")
                 return price
             
@@ -115,8 +258,8 @@ class DataFetcher:
         logger.error("All SPX price sources failed")
         return None
     
-    def get_es_price(self) -> Optional[float]:
-        """Get current ES future price (front month).
+    def _fetch_es_price(self) -> Optional[float]:
+        """Fetch current ES future price (front month).
         
         Returns:
             Current ES price or None if fetch fails
@@ -137,11 +280,9 @@ class DataFetcher:
         # Fallback to yfinance (use ES=F for front month ES futures)
         try:
             logger.info("Using yfinance as fallback for ES price...")
-            es = yf.Ticker("ES=F")  # E-mini S&P 500 Futures
-            data = es.history(period="1d", interval="1m")
+            price = self._get_yfinance_last_price("ES=F")  # E-mini S&P 500 Futures
             
-            if not data.empty:
-                price = float(data['Close'].iloc[-1])
+            if price is not None:
                 logger.info(f"ES current price (yfinance): {price}")
                 return price
             
@@ -159,9 +300,26 @@ class DataFetcher:
         logger.error("All ES price sources failed")
         return None
     
+    def _chain_cache_path(self, expiration_date: date) -> Path:
+        """Parquet cache file for the chain of expiration_date in the current minute."""
+        return config.data_dir / f"chain_{expiration_date.isoformat()}_{datetime.now().strftime('%Y%m%d_%H%M')}.parquet"
+    
+    def _sweep_chain_cache(self, max_age_seconds: float = 86400):
+        """Delete cached chain files older than max_age_seconds."""
+        cutoff = time.time() - max_age_seconds
+        for path in config.data_dir.glob("chain_*.parquet"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError as e:
+                logger.debug(f"Could not remove stale chain cache {path}: {e}")
+    
     def get_0dte_options(self, expiration_date: Optional[date] = None) -> pd.DataFrame:
         """Get 0DTE options data for SPX.
         
+        Chains are cached on disk per (expiration, minute), so repeated calls
+        within the same minute - from any process - skip the network.
+        
         Args:
             expiration_date: Target expiration date (default: today)
             
@@ -171,6 +329,36 @@ class DataFetcher:
         if expiration_date is None:
             expiration_date = date.today()
         
+        cache_path = self._chain_cache_path(expiration_date)
+        if cache_path.exists():
+            try:
+                # Parquet restores Arrow strings as python-backed strings; recast
+                df = apply_options_dtypes(pd.read_parquet(cache_path))
+                logger.info(f"Loaded {len(df)} option contracts from cache {cache_path.name}")
+                return df
+            except Exception as e:
+                logger.warning(f"Could not read chain cache {cache_path}: {e}")
+        
+        df = self._fetch_0dte_options(expiration_date)
+        
+        if not df.empty:
+            try:
+                df.to_parquet(cache_path, compression='zstd', index=False)
+                self._sweep_chain_cache()
+            except Exception as e:
+                logger.warning(f"Could not write chain cache {cache_path}: {e}")
+        
+        return df
+    
+    def _fetch_0dte_options(self, expiration_date: date) -> pd.DataFrame:
+        """Fetch 0DTE options data for SPX (Polygon, then Yahoo Finance).
+        
+        Args:
+            expiration_date: Target expiration date
+            
+        Returns:
+            DataFrame with options data including strikes, OI, volume, greeks
+        """
         # If Polygon isn't available, try real Yahoo Finance options (free) and otherwise return no data.
         if not self.use_polygon or not self.client:
             logger.warning("Polygon API not available - trying Yahoo Finance options")
@@ -182,55 +370,29 @@ class DataFetcher:
             
             logger.info(f"Fetching 0DTE options for SPX expiring {exp_str}")
             
-            # Get options contracts for SPX
-            options_data = []
-            
-            # Fetch both calls and puts
-            for contract_type in ['call', 'put']:
-                try:
-                    contracts = self.client.list_options_contracts(
-                        underlying_ticker=config.spx_symbol,
-                        contract_type=contract_type,
-                        expiration_date=exp_str,
-                        limit=1000
-                    )
-                    
-                    for contract in contracts:
-                        # Get snapshot for OI, volume, greeks
-                        try:
-                            snapshot = self.client.get_snapshot_option(
-                                underlying_ticker=config.spx_symbol,
-                                option_contract=contract.ticker
-                            )
-                            
-                            if snapshot and snapshot.day:
-                                options_data.append({
-                                    'ticker': contract.ticker,
-                                    'strike': contract.strike_price,
-                                    'type': contract_type,
-                                    'expiration': contract.expiration_date,
-                                    'volume': snapshot.day.volume or 0,
-                                    'open_interest': snapshot.open_interest or 0,
-                                    'implied_volatility': snapshot.implied_volatility,
-                                    'delta': snapshot.greeks.delta if snapshot.greeks else None,
-                                    'gamma': snapshot.greeks.gamma if snapshot.greeks else None,
-                                    'theta': snapshot.greeks.theta if snapshot.greeks else None,
-                                    'vega': snapshot.greeks.vega if snapshot.greeks else None,
-                                })
-                        except Exception as e:
-                            logger.debug(f"Could not fetch snapshot for {contract.ticker}: {e}")
-                            continue
-                            
-                except Exception as e:
-                    logger.error(f"Error fetching {contract_type} contracts: {e}")
-                    continue
-            
-            if not options_data:
+            # Fetch calls and puts together: one paginated chain snapshot
+            # instead of a snapshot request per contract
+            try:
+                options_data = self._fetch_polygon_chain_snapshot(exp_str)
+            except Exception as e:
+                logger.warning(f"Bulk chain snapshot failed ({e}) - fetching per contract")
+                options_data = []
+                for contract_type in ['call', 'put']:
+                    try:
+                        options_data.extend(self._fetch_polygon_contract_snapshots(contract_type, exp_str))
+                    except Exception as e:
+                        logger.error(f"Error fetching {contract_type} contracts: {e}")
+                        continue
+            
+            df = pd.DataFrame(options_data)
+            
+            if df.empty:
                 logger.warning("No options data retrieved from Polygon - trying Yahoo Finance")
                 return self._fetch_yfinance_options(expiration_date)
             
-            df = pd.DataFrame(options_data)
-            logger.info(f"Fetched {len(df)} option contracts ({len(df[df['type']=='call'])} calls, {len(df[df['type']=='put'])} puts)")
+            df = apply_options_dtypes(df)
+            counts = df['type'].value_counts()
+            logger.info(f"Fetched {len(df)} option contracts ({counts.get('call', 0)} calls, {counts.get('put', 0)} puts)")
             
             return df
             
@@ -239,6 +401,121 @@ class DataFetcher:
             logger.warning("Falling back to Yahoo Finance")
             return self._fetch_yfinance_options(expiration_date)
     
+    def _fetch_polygon_chain_snapshot(self, exp_str: str) -> Dict[str, List]:
+        """Fetch the whole chain (calls and puts) from Polygon's option chain snapshot.
+        
+        Args:
+            exp_str: Expiration date (YYYY-MM-DD)
+            
+        Returns:
+            Column name -> values (DataFrame-ready, no per-row dicts)
+        """
+        columns = {name: [] for name in (
+            'ticker', 'strike', 'type', 'expiration', 'volume', 'open_interest',
+            'implied_volatility', 'delta', 'gamma', 'theta', 'vega'
+        )}
+        snapshots = self.client.list_snapshot_options_chain(
+            config.spx_symbol,
+            params={
+                'expiration_date': exp_str,
+                'limit': 250,
+            }
+        )
+        
+        for snapshot in snapshots:
+            details = snapshot.details
+            if not details or not snapshot.day:
+                continue
+            if details.contract_type not in ('call', 'put'):
+                continue
+            greeks = snapshot.greeks
+            columns['ticker'].append(details.ticker)
+            columns['strike'].append(details.strike_price)
+            columns['type'].append(details.contract_type)
+            columns['expiration'].append(details.expiration_date)
+            columns['volume'].append(snapshot.day.volume or 0)
+            columns['open_interest'].append(snapshot.open_interest or 0)
+            columns['implied_volatility'].append(snapshot.implied_volatility)
+            columns['delta'].append(greeks.delta if greeks else None)
+            columns['gamma'].append(greeks.gamma if greeks else None)
+            columns['theta'].append(greeks.theta if greeks else None)
+            columns['vega'].append(greeks.vega if greeks else None)
+        
+        return columns
+    
+    def _throttle_polygon(self):
+        """Block until the next Polygon request slot (if a rate limit is set)."""
+        rate = config.polygon_max_requests_per_second
+        if rate <= 0:
+            return
+        
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + 1.0 / rate
+        
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _fetch_polygon_contract_snapshots(self, contract_type: str, exp_str: str) -> List[Dict]:
+        """Fetch one side of the chain contract by contract (fallback path).
+        
+        Snapshots are requested concurrently on a thread pool, since each
+        call is pure network wait.
+        
+        Args:
+            contract_type: 'call' or 'put'
+            exp_str: Expiration date (YYYY-MM-DD)
+            
+        Returns:
+            List of option rows
+        """
+        contracts = list(self.client.list_options_contracts(
+            underlying_ticker=config.spx_symbol,
+            contract_type=contract_type,
+            expiration_date=exp_str,
+            limit=1000
+        ))
+        
+        def fetch_snapshot(contract):
+            # Get snapshot for OI, volume, greeks
+            try:
+                self._throttle_polygon()
+                snapshot = self.client.get_snapshot_option(
+                    underlying_asset=config.spx_symbol,
+                    option_contract=contract.ticker
+                )
+            except Exception as e:
+                # Positional args: loguru only formats if a sink accepts DEBUG
+                logger.debug("Could not fetch snapshot for {}: {}", contract.ticker, e)
+                return None
+            
+            if not snapshot or not snapshot.day:
+                return None
+            
+            return {
+                'ticker': contract.ticker,
+                'strike': contract.strike_price,
+                'type': contract_type,
+                'expiration': contract.expiration_date,
+                'volume': snapshot.day.volume or 0,
+                'open_interest': snapshot.open_interest or 0,
+                'implied_volatility': snapshot.implied_volatility,
+                'delta': snapshot.greeks.delta if snapshot.greeks else None,
+                'gamma': snapshot.greeks.gamma if snapshot.greeks else None,
+                'theta': snapshot.greeks.theta if snapshot.greeks else None,
+                'vega': snapshot.greeks.vega if snapshot.greeks else None,
+            }
+        
+        if not contracts:
+            return []
+        
+        max_workers = max(1, min(config.polygon_max_workers, len(contracts)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            rows = [row for row in executor.map(fetch_snapshot, contracts) if row is not None]
+        
+        return rows
+    
     def _fetch_yfinance_options(self, expiration_date: date) -> pd.DataFrame:
         """Fetch real options data from Yahoo Finance (free).
         
@@ -252,10 +529,10 @@ class DataFetcher:
             logger.info("Fetching real SPX options data from Yahoo Finance...")
             
             # Yahoo uses ^SPX for SPX index
-            ticker = yf.Ticker("^SPX")
+            ticker = _yf_ticker("^SPX")
             
-            # Get available expiration dates
-            expirations = ticker.options
+            # Get available expiration dates (cached for the day)
+            expirations = self._get_yfinance_expirations(ticker, "^SPX")
             
             if not expirations:
                 logger.warning("No expirations available from Yahoo Finance")
@@ -279,84 +556,112 @@ class DataFetcher:
             # Get options chain
             opt_chain = ticker.option_chain(expiration_str)
             
-            options_data = []
+            # Spot is constant while one chain is built: fetch it once
+            spot = self.get_spx_price() or 5850
             
-            # Process calls
+            # Process calls and puts column-wise (no per-row Python)
+            frames = []
             if not opt_chain.calls.empty:
-                calls = opt_chain.calls
-                for _, row in calls.iterrows():
-                    # Calculate gamma approximation from delta if not available
-                    gamma = self._estimate_gamma(
-                        row.get('strike', 0),
-                        self.get_spx_price() or 5850,
-                        row.get('impliedVolatility', 0.15),
-                        'call'
-                    )
-                    
-                    options_data.append({
-                        'ticker': f"SPX{int(row['strike'])}C",
-                        'strike': row['strike'],
-                        'type': 'call',
-                        'expiration': expiration_str,
-                        'volume': int(row.get('volume', 0)) if pd.notna(row.get('volume')) else 0,
-                        'open_interest': int(row.get('openInterest', 0)) if pd.notna(row.get('openInterest')) else 0,
-                        'implied_volatility': row.get('impliedVolatility', 0.15),
-                        'delta': self._estimate_delta(row['strike'], self.get_spx_price() or 5850, 'call'),
-                        'gamma': gamma,
-                        'theta': -0.5,  # Approximation
-                        'vega': 0.3,    # Approximation
-                    })
-            
-            # Process puts
+                frames.append(self._yfinance_chain_frame(opt_chain.calls, 'call', expiration_str, spot))
             if not opt_chain.puts.empty:
-                puts = opt_chain.puts
-                for _, row in puts.iterrows():
-                    gamma = self._estimate_gamma(
-                        row.get('strike', 0),
-                        self.get_spx_price() or 5850,
-                        row.get('impliedVolatility', 0.15),
-                        'put'
-                    )
-                    
-                    options_data.append({
-                        'ticker': f"SPX{int(row['strike'])}P",
-                        'strike': row['strike'],
-                        'type': 'put',
-                        'expiration': expiration_str,
-                        'volume': int(row.get('volume', 0)) if pd.notna(row.get('volume')) else 0,
-                        'open_interest': int(row.get('openInterest', 0)) if pd.notna(row.get('openInterest')) else 0,
-                        'implied_volatility': row.get('impliedVolatility', 0.16),
-                        'delta': self._estimate_delta(row['strike'], self.get_spx_price() or 5850, 'put'),
-                        'gamma': gamma,
-                        'theta': -0.5,  # Approximation
-                        'vega': 0.3,    # Approximation
-                    })
-
-            if not options_data:
+                frames.append(self._yfinance_chain_frame(opt_chain.puts, 'put', expiration_str, spot))
+            
+            if not frames:
                 logger.warning("Yahoo Finance returned no options rows")
                 return pd.DataFrame()
-
-            df = pd.DataFrame(options_data)
-            logger.info(f"Fetched {len(df)} option rows from Yahoo Finance")
+            
+            # Same compact schema as the Polygon and mock paths
+            df = apply_options_dtypes(pd.concat(frames, ignore_index=True))
+            counts = df['type'].value_counts()
+            logger.info(f"Fetched {len(df)} option rows from Yahoo Finance ({counts.get('call', 0)} calls, {counts.get('put', 0)} puts)")
             return df
 
         except Exception as e:
             logger.error(f"Error fetching options from Yahoo Finance: {e}")
             return pd.DataFrame()
+    
+    def _get_yfinance_expirations(self, ticker, symbol: str) -> Tuple[str, ...]:
+        """Get option expirations for symbol, fetched from Yahoo once per day.
+        
+        The list only changes when an expiration rolls off, so it is kept in
+        memory and in yfinance_expirations.json (like daily_spread.json).
+        
+        Args:
+            ticker: yf.Ticker for symbol
+            symbol: Yahoo symbol (cache key)
             
-            if not options_data:
-                logger.warning("No options data from Yahoo Finance")
-                return self._generate_mock_options_data()
-            
-            df = pd.DataFrame(options_data)
-            logger.info(f"Fetched {len(df)} REAL option contracts from Yahoo Finance ({len(df[df['type']=='call'])} calls, {len(df[df['type']=='put'])} puts)")
-            
-            return df
+        Returns:
+            Expiration date strings (YYYY-MM-DD)
+        """
+        today = date.today().isoformat()
+        
+        if self._expirations_cache and self._expirations_cache[:2] == (today, symbol):
+            return self._expirations_cache[2]
+        
+        if self.expirations_cache_file.exists():
+            try:
+                with open(self.expirations_cache_file, 'r') as f:
+                    cached = json.load(f)
+                if cached.get('date') == today and cached.get('symbol') == symbol and cached.get('expirations'):
+                    self._expirations_cache = (today, symbol, tuple(cached['expirations']))
+                    logger.debug(f"Loaded cached Yahoo expirations for {symbol}")
+                    return self._expirations_cache[2]
+            except Exception as e:
+                logger.debug(f"Could not read cached Yahoo expirations: {e}")
+        
+        expirations = tuple(ticker.options or ())
+        
+        if expirations:
+            self._expirations_cache = (today, symbol, expirations)
+            try:
+                with open(self.expirations_cache_file, 'w') as f:
+                    json.dump({'date': today, 'symbol': symbol, 'expirations': list(expirations)}, f)
+            except Exception as e:
+                logger.debug(f"Could not cache Yahoo expirations: {e}")
+        
+        return expirations
+    
+    def _yfinance_chain_frame(self, chain: pd.DataFrame, option_type: str, expiration_str: str, spot: float) -> pd.DataFrame:
+        """Convert one side of a yfinance option chain to our options schema.
+        
+        Args:
+            chain: opt_chain.calls or opt_chain.puts
+            option_type: 'call' or 'put'
+            expiration_str: Expiration date (YYYY-MM-DD)
+            spot: Current spot price
             
-        except Exception as e:
-            logger.error(f"Yahoo Finance options fetch failed: {e}")
-            logger.warning("Falling back to mock data")
-            return self._generate_mock_options_data()
+        Returns:
+            DataFrame with one row per contract
+        """
+        strikes = chain['strike'].to_numpy(dtype=np.float64)
+        n = strikes.size
+        suffix = 'C' if option_type == 'call' else 'P'
+        
+        def column(name, default):
+            if name in chain.columns:
+                return chain[name].to_numpy(dtype=np.float64)
+            return np.full(n, default, dtype=np.float64)
+        
+        iv = column('impliedVolatility', 0.15 if option_type == 'call' else 0.16)
+        volume = column('volume', 0)
+        open_interest = column('openInterest', 0)
+        
+        # Gamma approximation: peaks at ATM, decays with distance
+        gamma = self._estimate_gamma(strikes, spot, column('impliedVolatility', 0.15), option_type)
+        
+        return pd.DataFrame({
+            'ticker': [f"SPX{k}{suffix}" for k in strikes.astype(np.int64)],
+            'strike': chain['strike'].to_numpy(),
+            'type': option_type,
+            'expiration': expiration_str,
+            'volume': np.nan_to_num(volume, nan=0).astype(np.int64),
+            'open_interest': np.nan_to_num(open_interest, nan=0).astype(np.int64),
+            'implied_volatility': iv,
+            'delta': self._estimate_delta_vec(strikes, spot, option_type),
+            'gamma': gamma,
+            'theta': -0.5,  # Approximation
+            'vega': 0.3,    # Approximation
+        })
     
     def _estimate_delta(self, strike: float, spot: float, option_type: str) -> float:
         """Estimate delta based on moneyness.
@@ -369,47 +674,58 @@ class DataFetcher:
         Returns:
             Estimated delta
         """
-        moneyness = strike / spot
+        return float(self._estimate_delta_vec(np.array([strike], dtype=np.float64), spot, option_type)[0])
+    
+    def _estimate_delta_vec(self, strikes: np.ndarray, spot: float, option_type: str) -> np.ndarray:
+        """Estimate delta from moneyness for an array of strikes.
+        
+        Args:
+            strikes: Strike prices
+            spot: Current spot price
+            option_type: 'call' or 'put'
+            
+        Returns:
+            Estimated deltas (same shape as strikes)
+        """
+        moneyness = np.asarray(strikes, dtype=np.float64) / spot
         
         if option_type == 'call':
-            if moneyness < 0.95:  # Deep ITM
-                return 0.95
-            elif moneyness < 0.98:
-                return 0.75
-            elif moneyness < 1.02:  # ATM
-                return 0.50
-            elif moneyness < 1.05:
-                return 0.25
-            else:  # OTM
-                return 0.05
-        else:  # put
-            if moneyness > 1.05:  # Deep ITM
-                return -0.95
-            elif moneyness > 1.02:
-                return -0.75
-            elif moneyness > 0.98:  # ATM
-                return -0.50
-            elif moneyness > 0.95:
-                return -0.25
-            else:  # OTM
-                return -0.05
+            # Deep ITM -> ATM -> OTM
+            return np.select(
+                [moneyness < 0.95, moneyness < 0.98, moneyness < 1.02, moneyness < 1.05],
+                [0.95, 0.75, 0.50, 0.25],
+                default=0.05
+            )
+        
+        # put: Deep ITM -> ATM -> OTM
+        return np.select(
+            [moneyness > 1.05, moneyness > 1.02, moneyness > 0.98, moneyness > 0.95],
+            [-0.95, -0.75, -0.50, -0.25],
+            default=-0.05
+        )
     
-    def _estimate_gamma(self, strike: float, spot: float, iv: float, option_type: str) -> float:
+    def _estimate_gamma(self, strike, spot: float, iv, option_type: str):
         """Estimate gamma - highest at ATM, decreases with distance.
         
         Args:
-            strike: Strike price
+            strike: Strike price (scalar or array)
             spot: Current spot price
-            iv: Implied volatility
+            iv: Implied volatility (scalar or array matching strike)
             option_type: 'call' or 'put'
             
         Returns:
-            Estimated gamma
+            Estimated gamma (float for scalar input, else array)
         """
-        distance = abs(strike - spot)
-        # Gamma peaks at ATM and decays exponentially
-        gamma = 0.002 * np.exp(-distance / 40) * (1 + iv)
-        return gamma
+        strike = np.asarray(strike, dtype=np.float64)
+        # Gamma peaks at ATM and decays exponentially; computed in place in
+        # one buffer instead of a temporary per operation
+        gamma = np.subtract(strike, spot, out=np.empty_like(strike))
+        np.abs(gamma, out=gamma)
+        gamma /= -40.0
+        np.exp(gamma, out=gamma)
+        gamma *= 0.002
+        gamma *= 1.0 + np.asarray(iv, dtype=np.float64)
+        return float(gamma) if gamma.ndim == 0 else gamma
     
     def _generate_mock_options_data(self) -> pd.DataFrame:
         """Generate realistic mock options data for testing.
@@ -419,8 +735,9 @@ class DataFetcher:
         """
         logger.info("Generating mock options data for testing...")
         
-        # Get current SPX price (or use default)
-        spx_price = self.get_spx_price()
+        # Get current SPX price (or use default); the strike center only needs
+        # to be roughly current, so reuse it for a minute
+        spx_price = self._cached_price("MOCK_ANCHOR", self.get_spx_price, ttl=MOCK_ANCHOR_TTL_SECONDS)
         if spx_price is None:
             spx_price = 5850.0  # Default value
             logger.info(f"Using default SPX price: {spx_price}")
@@ -432,61 +749,54 @@ class DataFetcher:
             5
         )
         
-        options_data = []
-        
-        for strike in strikes:
-            # Distance from current price affects volume and OI
-            distance = abs(strike - spx_price)
-            
-            # Calls
-            call_volume = int(max(100, 1000 * np.exp(-distance / 50)))
-            call_oi = int(call_volume * np.random.uniform(2, 5))
-            call_gamma = 0.001 * np.exp(-distance / 30)
-            
-            options_data.append({
-                'ticker': f'SPX{int(strike)}C',
-                'strike': strike,
-                'type': 'call',
-                'expiration': date.today().isoformat(),
-                'volume': call_volume,
-                'open_interest': call_oi,
-                'implied_volatility': 0.15 + distance / 1000,
-                'delta': max(0.01, 1 - distance / 200) if strike > spx_price else max(0.5, 0.99 - distance / 100),
-                'gamma': call_gamma,
-                'theta': -0.5,
-                'vega': 0.3,
-            })
-            
-            # Puts
-            put_volume = int(max(100, 1200 * np.exp(-distance / 50)))
-            put_oi = int(put_volume * np.random.uniform(2, 5))
-            put_gamma = 0.001 * np.exp(-distance / 30)
-            
-            options_data.append({
-                'ticker': f'SPX{int(strike)}P',
-                'strike': strike,
-                'type': 'put',
-                'expiration': date.today().isoformat(),
-                'volume': put_volume,
-                'open_interest': put_oi,
-                'implied_volatility': 0.16 + distance / 1000,
-                'delta': -max(0.01, 1 - distance / 200) if strike < spx_price else -max(0.5, 0.99 - distance / 100),
-                'gamma': put_gamma,
-                'theta': -0.5,
-                'vega': 0.3,
-            })
-        
-        df = pd.DataFrame(options_data)
+        n = strikes.size
+        
+        # Distance from current price affects volume and OI
+        distance = np.abs(strikes - spx_price)
+        decay = np.exp(-distance / 50)
+        gamma = 0.001 * np.exp(-distance / 30)
+        
+        # One batched draw for all OI multipliers (calls row 0, puts row 1)
+        oi_multiplier = np.random.default_rng().uniform(2, 5, size=(2, n))
+        
+        call_volume = np.maximum(100, 1000 * decay).astype(np.int64)
+        put_volume = np.maximum(100, 1200 * decay).astype(np.int64)
+        call_oi = (call_volume * oi_multiplier[0]).astype(np.int64)
+        put_oi = (put_volume * oi_multiplier[1]).astype(np.int64)
+        
+        otm_delta = np.maximum(0.01, 1 - distance / 200)
+        itm_delta = np.maximum(0.5, 0.99 - distance / 100)
+        call_delta = np.where(strikes > spx_price, otm_delta, itm_delta)
+        put_delta = -np.where(strikes < spx_price, otm_delta, itm_delta)
+        
+        strike_labels = strikes.astype(np.int64)
+        
+        options_data = {
+            'ticker': [f'SPX{k}{suffix}' for suffix in ('C', 'P') for k in strike_labels],
+            'strike': np.concatenate([strikes, strikes]),
+            'type': np.repeat(['call', 'put'], n),
+            'expiration': date.today().isoformat(),
+            'volume': np.concatenate([call_volume, put_volume]),
+            'open_interest': np.concatenate([call_oi, put_oi]),
+            'implied_volatility': np.concatenate([0.15 + distance / 1000, 0.16 + distance / 1000]),
+            'delta': np.concatenate([call_delta, put_delta]),
+            'gamma': np.concatenate([gamma, gamma]),
+            'theta': -0.5,
+            'vega': 0.3,
+        }
+        
+        df = apply_options_dtypes(pd.DataFrame(options_data))
         logger.info(f"Generated {len(df)} mock option contracts (TESTING MODE)")
         
         return df
     
-    def filter_options_by_range(self, df: pd.DataFrame, current_price: float) -> pd.DataFrame:
+    def filter_options_by_range(self, df: pd.DataFrame, current_price: float, copy: bool = False) -> pd.DataFrame:
         """Filter options to strikes within specified range of current price.
         
         Args:
             df: Options DataFrame
             current_price: Current SPX price
+            copy: Return an independent copy (only needed if the caller mutates it)
             
         Returns:
             Filtered DataFrame
@@ -494,28 +804,47 @@ class DataFetcher:
         if df.empty:
             return df
         
-        range_pct = config.strike_range_percent / 100
-        lower_bound = current_price * (1 - range_pct)
-        upper_bound = current_price * (1 + range_pct)
+        range_pct = config.strike_range_percent
+        min_volume = config.min_volume_threshold
+        lower_bound = current_price * (1 - range_pct / 100)
+        upper_bound = current_price * (1 + range_pct / 100)
         
-        filtered = df[
-            (df['strike'] >= lower_bound) & 
-            (df['strike'] <= upper_bound) &
-            (df['volume'] >= config.min_volume_threshold)
-        ].copy()
+        # One mask over the raw NumPy columns (no expression parsing, no
+        # intermediate boolean Series)
+        strikes = df['strike'].to_numpy()
+        mask = np.logical_and.reduce([
+            strikes >= lower_bound,
+            strikes <= upper_bound,
+            df['volume'].to_numpy() >= min_volume,
+        ])
+        filtered = df[mask]
+        if copy:
+            filtered = filtered.copy()
         
-        logger.info(f"Filtered to {len(filtered)} contracts within ±{config.strike_range_percent}% (${lower_bound:.2f} - ${upper_bound:.2f})")
+        logger.info(f"Filtered to {len(filtered)} contracts within ±{range_pct}% (${lower_bound:.2f} - ${upper_bound:.2f})")
         
         return filtered
     
-    def get_spread(self) -> Optional[float]:
+    def get_spread(self, spx_price: Optional[float] = None, es_price: Optional[float] = None) -> Optional[float]:
         """Calculate ES-SPX spread.
         
+        Args:
+            spx_price: Already fetched SPX price (optional)
+            es_price: Already fetched ES price (optional)
+            
         Returns:
             Spread value (ES - SPX) or None if calculation fails
         """
-        spx_price = self.get_spx_price()
-        es_price = self.get_es_price()
+        if spx_price is None and es_price is None:
+            # Independent network calls: overlap them
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                spx_future = executor.submit(self.get_spx_price)
+                es_future = executor.submit(self.get_es_price)
+                spx_price, es_price = spx_future.result(), es_future.result()
+        elif spx_price is None:
+            spx_price = self.get_spx_price()
+        elif es_price is None:
+            es_price = self.get_es_price()
         
         if spx_price is None or es_price is None:
             logger.error("Could not calculate spread - missing price data")
@@ -526,13 +855,20 @@ class DataFetcher:
         
         return spread
     
-    def save_data(self, df: pd.DataFrame, filename: str):
-        """Save options data to CSV.
+    def save_data(self, df: pd.DataFrame, filename: str, format: str = 'parquet'):
+        """Save options data to Parquet (keeps the compact dtypes) or CSV.
         
         Args:
             df: DataFrame to save
-            filename: Output filename
+            filename: Output filename (suffix is replaced with the format's)
+            format: 'parquet' (default) or 'csv'
         """
-        filepath = config.data_dir / filename
-        df.to_csv(filepath, index=False)
+        if format not in ('parquet', 'csv'):
+            raise ValueError(f"Unsupported format: {format}")
+        
+        filepath = (config.data_dir / filename).with_suffix(f'.{format}')
+        if format == 'parquet':
+            df.to_parquet(filepath, engine='pyarrow', compression='snappy', index=False)
+        else:
+            df.to_csv(filepath, index=False)
         logger.info(f"Data saved to {filepath}")
@@ -1,8 +1,9 @@
 """SPX to ES conversion module with spread calculation."""
 from typing import Dict, Optional
-from datetime import datetime
+from datetime import datetime, date
 from loguru import logger
-import json
+import numpy as np
+import orjson
 from pathlib import Path
 from config import config
 
@@ -15,6 +16,9 @@ class SPXtoESConverter:
         self.spread = None
         self.spread_timestamp = None
         self.spread_cache_file = config.data_dir / "daily_spread.json"
+        # Parsed spread cache file, reused while its mtime is unchanged
+        self._cache_mtime = None
+        self._cache_payload = None
         
     def calculate_spread(self, spx_price: float, es_price: float) -> float:
         """Calculate and cache ES-SPX spread.
@@ -29,20 +33,23 @@ class SPXtoESConverter:
         Returns:
             Spread value (ES - SPX)
         """
+        now = datetime.now()
         self.spread = es_price - spx_price
-        self.spread_timestamp = datetime.now()
+        self.spread_timestamp = now
         
         # Cache spread to file
         spread_data = {
             'spread': self.spread,
-            'timestamp': self.spread_timestamp.isoformat(),
+            'timestamp': now.isoformat(),
             'spx_price': spx_price,
             'es_price': es_price,
-            'date': datetime.now().date().isoformat()
+            'date': now.date().isoformat()
         }
         
-        with open(self.spread_cache_file, 'w') as f:
-            json.dump(spread_data, f, indent=2)
+        self.spread_cache_file.write_bytes(orjson.dumps(spread_data, option=orjson.OPT_INDENT_2))
+        
+        self._cache_mtime = self.spread_cache_file.stat().st_mtime
+        self._cache_payload = spread_data
         
         logger.info(f"Spread calculated and cached: {self.spread:.2f} (ES: {es_price:.2f}, SPX: {spx_price:.2f})")
         
@@ -59,12 +66,17 @@ class SPXtoESConverter:
             return None
         
         try:
-            with open(self.spread_cache_file, 'r') as f:
-                spread_data = json.load(f)
+            mtime = self.spread_cache_file.stat().st_mtime
+            if mtime == self._cache_mtime:
+                spread_data = self._cache_payload
+            else:
+                spread_data = orjson.loads(self.spread_cache_file.read_bytes())
+                self._cache_mtime = mtime
+                self._cache_payload = spread_data
             
             # Check if spread is from today
             cached_date = spread_data.get('date')
-            today = datetime.now().date().isoformat()
+            today = date.today().isoformat()
             
             if cached_date == today:
                 self.spread = spread_data['spread']
@@ -108,7 +120,7 @@ class SPXtoESConverter:
             return None
         
         es_level = spx_level + spread
-        logger.debug(f"Converting: SPX ${spx_level:.2f} + spread {spread:.2f} = ES ${es_level:.2f}")
+        logger.debug("Converting: SPX ${:.2f} + spread {:.2f} = ES ${:.2f}", spx_level, spread, es_level)
         
         return es_level
     
@@ -130,20 +142,22 @@ class SPXtoESConverter:
         
         logger.info(f"Converting levels using spread: {spread:.2f}")
         
-        for level_name, spx_value in spx_levels.items():
-            if isinstance(spx_value, (int, float)):
-                es_value = self.convert_spx_level_to_es(spx_value)
-                
-                if es_value is not None:
-                    converted[level_name] = {
-                        'spx': spx_value,
-                        'es': es_value,
-                        'spread': spread
-                    }
-                    
-                    logger.info(f"{level_name}: SPX ${spx_value:.2f} → ES ${es_value:.2f} (spread: {spread:+.2f})")
-                else:
-                    logger.warning(f"Skipping {level_name} - conversion failed")
+        # Numeric levels only, converted in one vectorized add
+        numeric = [(name, value) for name, value in spx_levels.items() if isinstance(value, (int, float))]
+        
+        if numeric:
+            names, spx_values = zip(*numeric)
+            spx_arr = np.asarray(spx_values, dtype=np.float64)
+            es_arr = spx_arr + spread
+            
+            converted = {
+                name: {'spx': spx, 'es': es, 'spread': spread}
+                for name, spx, es in zip(names, spx_arr.tolist(), es_arr.tolist())
+            }
+            
+            logger.info("Levels SPX → ES: " + ", ".join(
+                f"{name} ${levels['spx']:.2f} → ${levels['es']:.2f}" for name, levels in converted.items()
+            ))
         
         logger.info(f"Successfully converted {len(converted)} levels from SPX to ES")
         
@@ -1,4 +1,5 @@
 """Gamma calculation engine - SpotGamma-like analysis."""
+import hashlib
 from typing import Dict, List, Tuple, Optional
 import pandas as pd
 import numpy as np
@@ -14,6 +15,10 @@ class GammaEngine:
         self.levels = {}
         self.regime = "neutral"
         
+        # Last process_options_data result, keyed on (price, options fingerprint)
+        self._last_key = None
+        self._last_result = None
+        
     def calculate_dealer_gamma(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate dealer gamma exposure per strike.
         
@@ -44,21 +49,17 @@ class GammaEngine:
         # Dealers sell options (net short), so they have opposite position
         # Calls: Dealers are short, so negative gamma exposure (multiplied by -1)
         # Puts: Dealers are short, so negative gamma exposure (multiplied by -1)
-        df['dealer_gamma'] = df.apply(
-            lambda row: -row['open_interest'] * row['gamma'] * 100,
-            axis=1
-        )
-        
-        # Separate call and put gamma
-        df['call_gamma'] = df.apply(
-            lambda row: row['dealer_gamma'] if row['type'] == 'call' else 0,
-            axis=1
-        )
-        
-        df['put_gamma'] = df.apply(
-            lambda row: row['dealer_gamma'] if row['type'] == 'put' else 0,
-            axis=1
-        )
+        # (vectorized over the columns, no per-row callbacks). float32 is ample
+        # for locating levels and halves the bytes every later pass streams
+        dealer_gamma = df['open_interest'].to_numpy(dtype=np.float32) * df['gamma'].to_numpy(dtype=np.float32) * np.float32(-100.0)
+        df['dealer_gamma'] = dealer_gamma
+        
+        # Separate call and put gamma. 'type' is a category from the fetcher,
+        # so Series.eq compares integer codes instead of Python strings
+        is_call = df['type'].eq('call').to_numpy()
+        is_put = df['type'].eq('put').to_numpy()
+        df['call_gamma'] = np.where(is_call, dealer_gamma, np.float32(0.0))
+        df['put_gamma'] = np.where(is_put, dealer_gamma, np.float32(0.0))
         
         logger.info("Dealer gamma exposure calculated")
         return df
@@ -75,20 +76,28 @@ class GammaEngine:
         if df.empty:
             return df
         
-        # Group by strike and sum gamma exposures
-        agg_df = df.groupby('strike').agg({
-            'dealer_gamma': 'sum',
-            'call_gamma': 'sum',
-            'put_gamma': 'sum',
-            'volume': 'sum',
-            'open_interest': 'sum'
-        }).reset_index()
-        
-        # Calculate net gamma
-        agg_df['net_gamma'] = agg_df['call_gamma'] + agg_df['put_gamma']
-        
-        # Sort by strike
-        agg_df = agg_df.sort_values('strike').reset_index(drop=True)
+        # Sort rows by strike once; each strike is then a contiguous run and
+        # every column is summed with one reduceat over the run starts
+        strikes = df['strike'].to_numpy()
+        order = np.argsort(strikes, kind='stable')
+        unique_strikes, starts = np.unique(strikes[order], return_index=True)
+        
+        def strike_sum(column):
+            return np.add.reduceat(df[column].to_numpy()[order], starts)
+        
+        call_gamma = strike_sum('call_gamma')
+        put_gamma = strike_sum('put_gamma')
+        
+        # Already sorted by strike (np.unique)
+        agg_df = pd.DataFrame({
+            'strike': unique_strikes,
+            'dealer_gamma': strike_sum('dealer_gamma'),
+            'call_gamma': call_gamma,
+            'put_gamma': put_gamma,
+            'volume': strike_sum('volume'),
+            'open_interest': strike_sum('open_interest'),
+            'net_gamma': call_gamma + put_gamma,
+        })
         
         logger.info(f"Aggregated to {len(agg_df)} unique strikes")
         return agg_df
@@ -97,7 +106,8 @@ class GammaEngine:
         """Identify key gamma levels: Put Wall, Call Wall, Gamma Flip.
         
         Args:
-            df: Aggregated DataFrame by strike with gamma exposures
+            df: Aggregated DataFrame by strike with gamma exposures, sorted by
+                strike (as returned by aggregate_by_strike)
             current_price: Current SPX price
             
         Returns:
@@ -105,48 +115,65 @@ class GammaEngine:
         """
         if df.empty:
             logger.warning("Cannot identify levels - empty DataFrame")
+            self.levels = {}
+            self.regime = "neutral"
             return {}
         
         levels = {}
         
+        # Work on the underlying arrays: boolean masks and argmax, no copies
+        strikes = df['strike'].to_numpy()
+        put_gamma = df['put_gamma'].to_numpy()
+        call_gamma = df['call_gamma'].to_numpy()
+        
         # Put Wall: Strike with maximum absolute put gamma below current price
-        put_strikes = df[df['strike'] < current_price].copy()
-        if put_strikes.empty:
-            put_strikes = df[df['strike'] <= current_price].copy()
-        if not put_strikes.empty:
-            put_wall_idx = put_strikes['put_gamma'].abs().idxmax()
-            levels['put_wall'] = float(put_strikes.loc[put_wall_idx, 'strike'])
-            levels['put_wall_gamma'] = float(put_strikes.loc[put_wall_idx, 'put_gamma'])
+        below = strikes < current_price
+        if not below.any():
+            below = strikes <= current_price
+        if below.any():
+            put_wall_idx = np.flatnonzero(below)[np.argmax(np.abs(put_gamma[below]))]
+            levels['put_wall'] = float(strikes[put_wall_idx])
+            levels['put_wall_gamma'] = float(put_gamma[put_wall_idx])
             logger.info(f"Put Wall identified at ${levels['put_wall']:.2f} (Gamma: {levels['put_wall_gamma']:.2e})")
         
         # Call Wall: Strike with maximum absolute call gamma above current price
-        call_strikes = df[df['strike'] > current_price].copy()
-        if call_strikes.empty:
-            call_strikes = df[df['strike'] >= current_price].copy()
-        if not call_strikes.empty:
-            call_wall_idx = call_strikes['call_gamma'].abs().idxmax()
-            levels['call_wall'] = float(call_strikes.loc[call_wall_idx, 'strike'])
-            levels['call_wall_gamma'] = float(call_strikes.loc[call_wall_idx, 'call_gamma'])
+        above = strikes > current_price
+        if not above.any():
+            above = strikes >= current_price
+        if above.any():
+            call_wall_idx = np.flatnonzero(above)[np.argmax(np.abs(call_gamma[above]))]
+            levels['call_wall'] = float(strikes[call_wall_idx])
+            levels['call_wall_gamma'] = float(call_gamma[call_wall_idx])
             logger.info(f"Call Wall identified at ${levels['call_wall']:.2f} (Gamma: {levels['call_wall_gamma']:.2e})")
         
         # Gamma Flip: Where net gamma changes sign (from negative to positive or vice versa)
         # This indicates transition from dealer long to short gamma (or vice versa)
-        df_sorted = df.sort_values('strike').copy()
-        df_sorted['gamma_sign_change'] = df_sorted['net_gamma'].diff().abs()
-        
-        # Find zero crossing or largest sign change near current price
-        near_price = df_sorted[
-            (df_sorted['strike'] >= current_price * 0.99) & 
-            (df_sorted['strike'] <= current_price * 1.01)
-        ]
+        # Strikes are sorted, so the ±1% window is a slice found by binary search
+        near_start = np.searchsorted(strikes, current_price * 0.99, side='left')
+        near_end = np.searchsorted(strikes, current_price * 1.01, side='right')
         
-        if not near_price.empty:
+        if near_end > near_start:
             # Find where net gamma crosses zero or is closest to zero
-            gamma_flip_idx = near_price['net_gamma'].abs().idxmin()
-            levels['gamma_flip'] = float(near_price.loc[gamma_flip_idx, 'strike'])
-            levels['gamma_flip_value'] = float(near_price.loc[gamma_flip_idx, 'net_gamma'])
+            net_gamma = df['net_gamma'].to_numpy()
+            gamma_flip_idx = near_start + int(np.argmin(np.abs(net_gamma[near_start:near_end])))
+            levels['gamma_flip'] = float(strikes[gamma_flip_idx])
+            levels['gamma_flip_value'] = float(net_gamma[gamma_flip_idx])
             logger.info(f"Gamma Flip identified at ${levels['gamma_flip']:.2f} (Net Gamma: {levels['gamma_flip_value']:.2e})")
         
+        # Regime follows directly from the flip, so set it here
+        if 'gamma_flip' in levels:
+            gamma_flip = levels['gamma_flip']
+            # If price is above gamma flip, dealers are long gamma (market is short gamma)
+            # This typically means lower volatility, mean reversion
+            if current_price > gamma_flip:
+                self.regime = "short_gamma"  # Market perspective
+                logger.info(f"Market regime: SHORT GAMMA (price ${current_price:.2f} > flip ${gamma_flip:.2f}) - Expect higher volatility")
+            else:
+                self.regime = "long_gamma"  # Market perspective
+                logger.info(f"Market regime: LONG GAMMA (price ${current_price:.2f} < flip ${gamma_flip:.2f}) - Expect mean reversion")
+        else:
+            self.regime = "neutral"
+        
         # Store levels
         self.levels = levels
         
@@ -165,48 +192,56 @@ class GammaEngine:
             return df
         
         # Calculate importance score
-        df = df.copy()
-        df['score'] = df['net_gamma'].abs() * df['volume']
+        score = np.abs(df['net_gamma'].to_numpy(dtype=np.float64)) * df['volume'].to_numpy(dtype=np.float64)
+        # NaN scores (missing gamma or volume) are left out, as nlargest does;
+        # with them in, np.partition could pick NaN as the cutoff
+        valid = np.flatnonzero(~np.isnan(score))
+        valid_score = score[valid]
+        n = min(config.top_levels_count, valid.size)
+        
+        # Select the top N in O(N) with a partition instead of a full sort.
+        # Ties at the cutoff go to the first rows, as with nlargest(keep='first')
+        if n < valid.size:
+            cutoff = np.partition(valid_score, valid.size - n)[valid.size - n]
+            above = valid[valid_score > cutoff]
+            at_cutoff = valid[valid_score == cutoff][:n - above.size]
+            top_idx = np.concatenate([above, at_cutoff])
+        else:
+            top_idx = valid
+        top_idx = top_idx[np.argsort(-score[top_idx], kind='stable')]
         
-        # Sort by score and take top N
-        top_levels = df.nlargest(config.top_levels_count, 'score')
+        top_levels = df.iloc[top_idx].assign(score=score[top_idx])
         
-        logger.info(f"Top {len(top_levels)} levels by importance:")
-        for _, row in top_levels.iterrows():
-            logger.info(f"  ${row['strike']:.2f} - Score: {row['score']:.2e}, Net Gamma: {row['net_gamma']:.2e}")
+        strikes = top_levels['strike'].to_numpy()
+        net_gamma = top_levels['net_gamma'].to_numpy()
+        logger.info(f"Top {len(top_levels)} levels by importance:\n" + "\n".join(
+            f"  ${strike:.2f} - Score: {level_score:.2e}, Net Gamma: {gamma:.2e}"
+            for strike, level_score, gamma in zip(strikes, score[top_idx], net_gamma)
+        ))
         
         return top_levels
     
     def determine_regime(self, df: pd.DataFrame, current_price: float) -> str:
-        """Determine market regime based on gamma exposure.
+        """Market regime from the last identify_key_levels call.
+        
+        The regime is set by identify_key_levels together with the gamma
+        flip; this is kept for callers that still ask for it separately.
         
         Args:
-            df: Aggregated DataFrame with net gamma
-            current_price: Current SPX price
+            df: Aggregated DataFrame with net gamma (unused)
+            current_price: Current SPX price (unused)
             
         Returns:
             Regime string: "long_gamma", "short_gamma", or "neutral"
         """
-        if df.empty or 'gamma_flip' not in self.levels:
-            return "neutral"
-        
-        gamma_flip = self.levels['gamma_flip']
-        
-        # If price is above gamma flip, dealers are long gamma (market is short gamma)
-        # This typically means lower volatility, mean reversion
-        if current_price > gamma_flip:
-            regime = "short_gamma"  # Market perspective
-            logger.info(f"Market regime: SHORT GAMMA (price ${current_price:.2f} > flip ${gamma_flip:.2f}) - Expect higher volatility")
-        else:
-            regime = "long_gamma"  # Market perspective
-            logger.info(f"Market regime: LONG GAMMA (price ${current_price:.2f} < flip ${gamma_flip:.2f}) - Expect mean reversion")
-        
-        self.regime = regime
-        return regime
+        return self.regime
     
     def process_options_data(self, df: pd.DataFrame, current_price: float) -> Tuple[pd.DataFrame, Dict[str, float], str]:
         """Complete gamma analysis pipeline.
         
+        Re-running on identical options data and price returns the previous
+        result (shared, so callers must not mutate it).
+        
         Args:
             df: Raw options DataFrame
             current_price: Current SPX price
@@ -214,6 +249,15 @@ class GammaEngine:
         Returns:
             Tuple of (aggregated_df, key_levels, regime)
         """
+        fingerprint = self._options_fingerprint(df)
+        key = (current_price, fingerprint) if fingerprint is not None else None
+        if key is not None and key == self._last_key:
+            logger.info("Options data unchanged - reusing previous gamma analysis")
+            df_agg, levels, regime = self._last_result
+            self.levels = levels
+            self.regime = regime
+            return self._last_result
+        
         logger.info("Starting gamma analysis pipeline")
         
         # Step 1: Calculate dealer gamma
@@ -228,9 +272,26 @@ class GammaEngine:
         # Step 4: Rank levels
         top_levels = self.rank_levels(df_agg)
         
-        # Step 5: Determine regime
-        regime = self.determine_regime(df_agg, current_price)
+        # Step 5: Regime (set by identify_key_levels from the gamma flip)
+        regime = self.regime
         
         logger.info("Gamma analysis pipeline completed")
         
-        return df_agg, levels, regime
+        self._last_key = key
+        self._last_result = (df_agg, levels, regime)
+        return self._last_result
+    
+    def _options_fingerprint(self, df: pd.DataFrame) -> Optional[bytes]:
+        """Content hash of the option columns that feed the analysis.
+        
+        Args:
+            df: Raw options DataFrame
+            
+        Returns:
+            16-byte BLAKE2b digest, or None if the columns are missing
+        """
+        columns = ['strike', 'type', 'open_interest', 'gamma', 'volume']
+        if df.empty or not set(columns).issubset(df.columns):
+            return None
+        hashed = pd.util.hash_pandas_object(df[columns], index=False)
+        return hashlib.blake2b(hashed.to_numpy().tobytes(), digest_size=16).digest()
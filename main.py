@@ -9,7 +9,7 @@ from gamma_engine import GammaEngine
 from es_converter import SPXtoESConverter
 from alert_system import AlertSystem
 import json
-from reporting import write_daily_table
+from reporting import gamma_profile_records, write_daily_table, write_latest_levels
 
 
 def setup_logging():
@@ -78,7 +78,7 @@ def run_full_analysis():
         
         # Save raw data
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        fetcher.save_data(filtered_df, f"options_{timestamp}.csv")
+        fetcher.save_data(filtered_df, f"options_{timestamp}.parquet")
         
         # Step 5: Calculate gamma levels
         logger.info("\n[STEP 5] Calculating gamma levels...")
@@ -103,12 +103,11 @@ def run_full_analysis():
             'regime': regime,
             'levels': levels,
             'converted_levels': converted_levels,
-            'gamma_profile': df_agg[['strike', 'net_gamma', 'call_gamma', 'put_gamma']].head(200).to_dict('records')
+            'gamma_profile': gamma_profile_records(df_agg, limit=200)
         }
         
         # Save results
-        with open(config.data_dir / "latest_levels.json", 'w') as f:
-            json.dump(results, f, indent=2)
+        write_latest_levels(config.data_dir, results)
 
         # Save daily table (CSV)
         try:
@@ -173,6 +172,7 @@ def run_quick_update():
                 logger.warning(f"⚠️ {len(triggered)} ALERTS TRIGGERED!")
                 for condition in triggered:
                     alerts.send_alert(condition, es_price)
+                alerts.wait_for_pending_alerts()
             
             # Display current status
             logger.info(f"SPX: ${spx_price:.2f} | ES: ${es_price:.2f}")
@@ -0,0 +1,158 @@
+"""Streaming SPX index price from Polygon's WebSocket feed."""
+from typing import Dict, Optional, Tuple
+import os
+import threading
+import time
+import orjson
+from loguru import logger
+from config import config
+
+
+# A streamed price older than this is treated as stale (callers fall back to REST)
+STREAM_MAX_AGE_SECONDS = 5.0
+
+# Latest streamed SPX value, published by the process that owns the socket.
+# Polygon allows one WebSocket per API key, so only the scheduler connects;
+# the dashboard reads this file through PublishedPriceStream
+STREAM_PRICE_FILE = "spx_stream.json"
+
+
+class PriceStream:
+    """Keep the latest SPX index value pushed by Polygon in memory.
+
+    The WebSocket client runs on a daemon thread; readers only look at the
+    last value, so no network I/O ever happens on the caller's thread.
+    Each SPX value is also written to STREAM_PRICE_FILE for other processes.
+    """
+
+    def __init__(self):
+        """Initialize the stream (not connected until start())."""
+        self.spx_ticker = f"I:{config.spx_symbol}"
+        self.publish_file = config.data_dir / STREAM_PRICE_FILE
+        self._prices: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """Start the background WebSocket thread if it isn't running.
+
+        A running thread does not mean prices are arriving: the socket may
+        still be connecting, or the key may be rejected or not entitled to
+        the feed. Use is_live() for that.
+
+        Returns:
+            True if the stream thread is (now) running
+        """
+        if not config.polygon_api_key:
+            return False
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return True
+            self._thread = threading.Thread(target=self._run, name="price-stream", daemon=True)
+            self._thread.start()
+
+        return True
+
+    def _run(self):
+        """Thread body: connect and dispatch messages until the socket gives up."""
+        try:
+            from polygon import WebSocketClient
+            from polygon.websocket.models import Market
+
+            client = WebSocketClient(
+                config.polygon_api_key,
+                market=Market.Indices,
+                subscriptions=[f"V.{self.spx_ticker}"]
+            )
+            logger.info(f"Price stream subscribed to V.{self.spx_ticker}")
+            client.run(self._handle_messages)
+        except Exception as e:
+            # Includes a rejected key (the client raises on auth_failed)
+            logger.warning(f"Price stream stopped: {e}")
+
+    def _handle_messages(self, messages):
+        """Store the latest value per ticker and publish the SPX one."""
+        now = time.monotonic()
+        for message in messages:
+            value = getattr(message, 'value', None)
+            ticker = getattr(message, 'ticker', None)
+            if value is not None and ticker:
+                self._prices[ticker] = (float(value), now)
+
+        spx = self._prices.get(self.spx_ticker)
+        if spx is not None and spx[1] == now:
+            self._publish(spx[0])
+
+    def _publish(self, price: float):
+        """Write the latest SPX value to STREAM_PRICE_FILE (atomic replace)."""
+        payload = {'ticker': self.spx_ticker, 'price': price, 'timestamp': time.time()}
+        tmp_file = self.publish_file.with_suffix('.tmp')
+        try:
+            tmp_file.write_bytes(orjson.dumps(payload))
+            os.replace(tmp_file, self.publish_file)
+        except OSError as e:
+            logger.debug("Could not publish streamed SPX price: {}", e)
+
+    def get_price(self, ticker: str, max_age: float = STREAM_MAX_AGE_SECONDS) -> Optional[float]:
+        """Latest streamed price for ticker.
+
+        Args:
+            ticker: Polygon ticker (e.g. 'I:SPX')
+            max_age: Maximum age in seconds
+
+        Returns:
+            Price or None if nothing recent was received
+        """
+        cached = self._prices.get(ticker)
+        if cached and time.monotonic() - cached[1] < max_age:
+            return cached[0]
+        return None
+
+    def get_spx_price(self, max_age: float = STREAM_MAX_AGE_SECONDS) -> Optional[float]:
+        """Latest streamed SPX value (None if stale or not streaming)."""
+        return self.get_price(self.spx_ticker, max_age)
+
+    def is_live(self) -> bool:
+        """True while fresh SPX values are arriving.
+
+        The client consumes the auth/status messages itself, so a received
+        value is the signal that the key was accepted and entitled.
+        """
+        return self.get_spx_price() is not None
+
+
+class PublishedPriceStream:
+    """Read the SPX value a PriceStream in another process publishes.
+
+    Same reader interface as PriceStream, without opening a socket.
+    """
+
+    def __init__(self):
+        """Initialize the reader."""
+        self.spx_ticker = f"I:{config.spx_symbol}"
+        self.publish_file = config.data_dir / STREAM_PRICE_FILE
+        # Parsed file, reused while its mtime is unchanged
+        self._mtime = None
+        self._payload = None
+
+    def get_spx_price(self, max_age: float = STREAM_MAX_AGE_SECONDS) -> Optional[float]:
+        """Latest published SPX value (None if stale or nothing published)."""
+        try:
+            mtime = self.publish_file.stat().st_mtime
+            if mtime != self._mtime:
+                self._payload = orjson.loads(self.publish_file.read_bytes())
+                self._mtime = mtime
+        except (OSError, ValueError):
+            return None
+
+        payload = self._payload
+        if payload.get('ticker') != self.spx_ticker:
+            return None
+        if time.time() - payload['timestamp'] < max_age:
+            return float(payload['price'])
+        return None
+
+    def is_live(self) -> bool:
+        """True while the socket owner is publishing fresh SPX values."""
+        return self.get_spx_price() is not None
@@ -1,35 +1,52 @@
-"""Reporting helpers (daily table outputs)."""
+"""Reporting helpers (latest levels JSON and daily table outputs)."""
 
 from __future__ import annotations
 
+import csv
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-import pandas as pd
+import orjson
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def _extract_level(levels: Dict[str, Any], name: str) -> Optional[float]:
-    value = levels.get(name)
-    if isinstance(value, (int, float)):
-        return float(value)
-    return None
+# Columns of the aggregated gamma frame stored as the chart profile
+GAMMA_PROFILE_COLUMNS = ("strike", "net_gamma", "call_gamma", "put_gamma")
 
 
 def _extract_converted_level(converted_levels: Dict[str, Any], name: str) -> tuple[Optional[float], Optional[float]]:
-    item = converted_levels.get(name, {}) if isinstance(converted_levels, dict) else {}
-    spx = item.get("spx") if isinstance(item, dict) else None
-    es = item.get("es") if isinstance(item, dict) else None
-    return (
-        float(spx) if isinstance(spx, (int, float)) else None,
-        float(es) if isinstance(es, (int, float)) else None,
-    )
+    item = converted_levels.get(name)
+    if not item:
+        return None, None
+    return item.get("spx"), item.get("es")
+
+
+def gamma_profile_records(df_agg: pd.DataFrame, limit: int = 200) -> List[Dict[str, float]]:
+    """Chart profile rows for the first `limit` strikes.
+
+    Same records as df_agg[...].head(limit).to_dict('records'), built
+    straight from the NumPy columns of the rows that are kept.
+    """
+    head = df_agg.iloc[:limit]
+    columns = {name: head[name].to_numpy().tolist() for name in GAMMA_PROFILE_COLUMNS}
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def write_latest_levels(data_dir: Path, results: Dict[str, Any]) -> Path:
+    """Write the analysis results to latest_levels.json with orjson."""
+    out_path = data_dir / "latest_levels.json"
+    out_path.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    return out_path
 
 
 def write_daily_table(data_dir: Path, results: Dict[str, Any]) -> Path:
-    """Write the daily summary table as CSV.
+    """Append the daily summary row to the month's CSV table.
 
-    The goal is a single, human-readable table per day with the key levels.
+    The goal is a single, human-readable table per month with the key
+    levels, one row per run (daily_table_YYYYMM.csv). The header is only
+    written when the file is created.
     """
     data_dir.mkdir(parents=True, exist_ok=True)
 
@@ -55,14 +72,19 @@ def write_daily_table(data_dir: Path, results: Dict[str, Any]) -> Path:
         "es_price": float(es_price) if isinstance(es_price, (int, float)) else None,
         "spread": float(spread) if isinstance(spread, (int, float)) else None,
         "regime": regime,
-        "put_wall_spx": put_wall_spx or _extract_level(levels, "put_wall"),
+        "put_wall_spx": put_wall_spx or levels.get("put_wall"),
         "put_wall_es": put_wall_es,
-        "call_wall_spx": call_wall_spx or _extract_level(levels, "call_wall"),
+        "call_wall_spx": call_wall_spx or levels.get("call_wall"),
         "call_wall_es": call_wall_es,
-        "gamma_flip_spx": gamma_flip_spx or _extract_level(levels, "gamma_flip"),
+        "gamma_flip_spx": gamma_flip_spx or levels.get("gamma_flip"),
         "gamma_flip_es": gamma_flip_es,
     }
 
-    out_path = data_dir / f"daily_table_{date_str}.csv"
-    pd.DataFrame([row]).to_csv(out_path, index=False)
+    out_path = data_dir / f"daily_table_{date_str[:6]}.csv"
+    write_header = not out_path.exists()
+    with open(out_path, "a", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        if write_header:
+            writer.writerow(row.keys())
+        writer.writerow(row.values())
     return out_path
@@ -1,7 +1,9 @@
 """Scheduler for automated daily tasks."""
 import schedule
+import threading
 import time
 from datetime import datetime
+from typing import Optional
 import pytz
 from loguru import logger
 from config import config
@@ -9,8 +11,22 @@ from data_fetcher import DataFetcher
 from gamma_engine import GammaEngine
 from es_converter import SPXtoESConverter
 from alert_system import AlertSystem
+from price_stream import PriceStream
 import json
-from reporting import write_daily_table
+from reporting import gamma_profile_records, write_daily_table, write_latest_levels
+
+
+# Prices fetched by one job are reused by the next within this many seconds
+PRICE_REUSE_SECONDS = 60
+
+# Alert check interval while SPX is streamed (checks are in-memory reads)
+STREAM_MONITOR_SECONDS = 5
+
+# Minimum seconds between REST ES polls when the stream is not live
+POLL_MONITOR_SECONDS = 60
+
+# Alert price label when ES is derived rather than quoted
+DERIVED_ES_SOURCE = "ES (derived from SPX + spread)"
 
 
 class GammaScheduler:
@@ -22,19 +38,46 @@ class GammaScheduler:
         self.engine = GammaEngine()
         self.converter = SPXtoESConverter()
         self.alerts = AlertSystem()
+        self.stream = PriceStream()
         self.timezone = pytz.timezone(config.timezone)
         
         # State
         self.is_running = False
         self.current_data = {}
+        self._last_es_poll = None
+        self._stop_event = threading.Event()
+        self._monitor_job = None
+        self._monitor_seconds = None
+    
+    def _get_price(self, name: str, fetch, store: bool = True) -> Optional[float]:
+        """Price from current_data if fetched within PRICE_REUSE_SECONDS, else fetch().
+        
+        Args:
+            name: current_data key ('spx_price' or 'es_price'); the fetch time
+                is kept under '<name>_ts' (monotonic seconds)
+            fetch: Fetcher method to call when the stored price is missing or stale
+            store: Record a newly fetched price in current_data
+            
+        Returns:
+            Price or None if fetch fails
+        """
+        fetched_at = self.current_data.get(f'{name}_ts')
+        if fetched_at is not None and time.monotonic() - fetched_at < PRICE_REUSE_SECONDS:
+            return self.current_data[name]
+        
+        price = fetch()
+        if price and store:
+            self.current_data[name] = price
+            self.current_data[f'{name}_ts'] = time.monotonic()
+        return price
         
     def job_load_options(self):
         """Job: Load SPX options data (13:45 CET)."""
         logger.info("🔄 JOB: Loading SPX options data")
         
         try:
-            # Get current SPX price
-            spx_price = self.fetcher.get_spx_price()
+            # Get current SPX price (also the spot used for the level calculation)
+            spx_price = self._get_price('spx_price', self.fetcher.get_spx_price)
             if not spx_price:
                 logger.error("Could not fetch SPX price")
                 return
@@ -50,11 +93,10 @@ class GammaScheduler:
             
             # Save data
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.fetcher.save_data(filtered_df, f"options_{timestamp}.csv")
+            self.fetcher.save_data(filtered_df, f"options_{timestamp}.parquet")
             
             # Store in state
             self.current_data['options_df'] = filtered_df
-            self.current_data['spx_price'] = spx_price
             
             logger.info("✅ Options data loaded successfully")
             
@@ -66,9 +108,10 @@ class GammaScheduler:
         logger.info("🔄 JOB: Calculating ES-SPX spread")
         
         try:
-            # Get current prices
-            spx_price = self.fetcher.get_spx_price()
-            es_price = self.fetcher.get_es_price()
+            # Get current prices (reused if a job just fetched them). A fresh
+            # SPX quote is not stored: 'spx_price' is the options spot
+            spx_price = self._get_price('spx_price', self.fetcher.get_spx_price, store=False)
+            es_price = self._get_price('es_price', self.fetcher.get_es_price)
             
             if not spx_price or not es_price:
                 logger.error("Could not fetch prices for spread calculation")
@@ -91,8 +134,8 @@ class GammaScheduler:
             spread = self.converter.get_spread()
             es_price = None
             if spread is None:
-                spx_now = self.fetcher.get_spx_price()
-                es_now = self.fetcher.get_es_price()
+                spx_now = self._get_price('spx_price', self.fetcher.get_spx_price, store=False)
+                es_now = self._get_price('es_price', self.fetcher.get_es_price)
                 if spx_now and es_now:
                     spread = self.converter.calculate_spread(spx_now, es_now)
                     es_price = es_now
@@ -122,11 +165,10 @@ class GammaScheduler:
                 'levels': levels,
                 'converted_levels': converted_levels,
                 'regime': regime,
-                'gamma_profile': df_agg[['strike', 'net_gamma', 'call_gamma', 'put_gamma']].head(200).to_dict('records')
+                'gamma_profile': gamma_profile_records(df_agg, limit=200)
             }
             
-            with open(config.data_dir / "latest_levels.json", 'w') as f:
-                json.dump(results, f, indent=2)
+            write_latest_levels(config.data_dir, results)
 
             # Write daily table
             try:
@@ -164,24 +206,69 @@ class GammaScheduler:
         except Exception as e:
             logger.error(f"Error in job_activate_alerts: {e}")
     
+    def _live_es_price(self) -> Optional[float]:
+        """ES price derived from the streamed SPX value and the daily spread.
+        
+        ES levels are SPX levels + the same spread, so distances to them are
+        unchanged by using SPX + spread instead of the ES quote.
+        
+        Returns:
+            ES price or None if the stream is stale or no spread is available
+        """
+        spx_price = self.stream.get_spx_price()
+        if spx_price is None:
+            return None
+        spread = self.converter.get_spread()
+        if spread is None:
+            return None
+        return spx_price + spread
+    
     def job_monitor_alerts(self):
-        """Job: Monitor and trigger alerts (runs live every minute)."""
+        """Job: Monitor and trigger alerts (streamed SPX, else ES polled every minute)."""
         try:
-            # Get current ES price
-            es_price = self.fetcher.get_es_price()
+            # Get current ES price: from the stream when live, else poll REST
+            es_price = self._live_es_price()
+            price_source = DERIVED_ES_SOURCE
+            
+            # Check every few seconds only while streamed prices are arriving
+            self._schedule_monitor(STREAM_MONITOR_SECONDS if es_price is not None else POLL_MONITOR_SECONDS)
+            
+            if es_price is None:
+                now = time.monotonic()
+                if self._last_es_poll is not None and now - self._last_es_poll < POLL_MONITOR_SECONDS:
+                    return
+                self._last_es_poll = now
+                self.stream.start()  # restart the stream if its thread exited
+                es_price = self.fetcher.get_es_price()
+                price_source = "ES"
+            
             if not es_price:
                 return
             
             # Check alert conditions
-            triggered = self.alerts.check_all_conditions(es_price)
+            triggered = self.alerts.check_all_conditions(es_price, price_source=price_source)
             
             # Send notifications for triggered alerts
             for condition in triggered:
-                self.alerts.send_alert(condition, es_price)
+                self.alerts.send_alert(condition, es_price, price_source=price_source)
             
         except Exception as e:
             logger.error(f"Error in job_monitor_alerts: {e}")
     
+    def _schedule_monitor(self, seconds: int):
+        """(Re)schedule job_monitor_alerts every `seconds` seconds.
+        
+        Args:
+            seconds: Monitor interval; nothing changes if it is already set
+        """
+        if seconds == self._monitor_seconds:
+            return
+        if self._monitor_job is not None:
+            schedule.cancel_job(self._monitor_job)
+            logger.info(f"Alert monitoring every {seconds}s")
+        self._monitor_job = schedule.every(seconds).seconds.do(self.job_monitor_alerts)
+        self._monitor_seconds = seconds
+    
     def job_save_daily_log(self):
         """Job: Save daily log (22:00 CET)."""
         logger.info("🔄 JOB: Saving daily log")
@@ -223,8 +310,13 @@ class GammaScheduler:
         schedule.every().day.at("15:32").do(self.job_activate_alerts)
         schedule.every().day.at("22:00").do(self.job_save_daily_log)
         
-        # Alert monitoring (every minute during market hours)
-        schedule.every(1).minutes.do(self.job_monitor_alerts)
+        # Alert monitoring: once a minute until streamed SPX values actually
+        # arrive (a started socket may never authenticate), then every few
+        # seconds; job_monitor_alerts switches the interval both ways
+        self.stream.start()
+        self._monitor_job = None
+        self._monitor_seconds = None
+        self._schedule_monitor(POLL_MONITOR_SECONDS)
         
         logger.info("✅ Schedule setup complete")
         logger.info("Scheduled jobs:")
@@ -232,13 +324,14 @@ class GammaScheduler:
         logger.info("  15:30 - Calculate spread")
         logger.info("  15:31 - Calculate gamma levels")
         logger.info("  15:32 - Activate alerts")
-        logger.info("  Every minute - Monitor alerts")
+        logger.info(f"  Every {POLL_MONITOR_SECONDS}s ({STREAM_MONITOR_SECONDS}s while SPX is streamed) - Monitor alerts")
         logger.info("  22:00 - Save daily log")
     
     def run(self):
         """Start the scheduler."""
         self.setup_schedule()
         self.is_running = True
+        self._stop_event.clear()
         
         logger.info("🚀 Scheduler started - waiting for scheduled jobs...")
         logger.info(f"Timezone: {config.timezone}")
@@ -247,16 +340,31 @@ class GammaScheduler:
         try:
             while self.is_running:
                 schedule.run_pending()
-                time.sleep(1)
+                # Sleep until the next job is due instead of waking every
+                # second; stop() interrupts the wait
+                idle = schedule.idle_seconds()
+                self._stop_event.wait(POLL_MONITOR_SECONDS if idle is None else max(idle, 0))
         except KeyboardInterrupt:
             logger.info("Scheduler stopped by user")
             self.is_running = False
+        finally:
+            self._close_alerts()
     
     def stop(self):
         """Stop the scheduler."""
         self.is_running = False
+        self._stop_event.set()
         schedule.clear()
+        self._close_alerts()
         logger.info("Scheduler stopped")
+    
+    def _close_alerts(self):
+        """Deliver queued alerts, then flush the alert log and close channel connections."""
+        try:
+            self.alerts.wait_for_pending_alerts()
+            self.alerts.close()
+        except Exception as e:
+            logger.error(f"Error closing alert system: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,49 @@
+"""Tests for alert_system.AlertSystem condition checks."""
+from alert_system import AlertCondition, AlertSystem
+
+
+def make_system(tmp_path, *levels):
+    system = AlertSystem()
+    system.alert_log_file = tmp_path / "alerts.jsonl"
+    for name, es_level in levels:
+        system.add_condition(AlertCondition(name, es_level, distance_threshold=1.0))
+    return system
+
+
+def test_fires_once_until_reset(tmp_path):
+    system = make_system(tmp_path, ("put_wall", 5800.0))
+    
+    assert [c.level_name for c in system.check_all_conditions(5800.5)] == ["put_wall"]
+    assert system.check_all_conditions(5800.5) == []
+    system.close()
+
+
+def test_single_condition_reset_fires_again(tmp_path):
+    system = make_system(tmp_path, ("put_wall", 5800.0), ("call_wall", 5900.0))
+    
+    system.check_all_conditions(5800.5)
+    system.check_all_conditions(5900.5)
+    
+    # Reset only one condition directly, without going through the system
+    system.conditions[0].reset()
+    
+    assert [c.level_name for c in system.check_all_conditions(5800.5)] == ["put_wall"]
+    assert system.check_all_conditions(5900.5) == []
+    system.close()
+
+
+def test_new_levels_and_direct_triggers_are_seen(tmp_path):
+    system = make_system(tmp_path, ("put_wall", 5800.0))
+    system.check_all_conditions(5790.0)
+    
+    # Replacing the levels after the arrays were built
+    system.setup_levels({'gamma_flip': {'spx': 5775.0, 'es': 5825.0}})
+    assert system.check_all_conditions(5800.0) == []
+    assert [c.level_name for c in system.check_all_conditions(5825.0)] == ["gamma_flip"]
+    
+    # Triggering a condition directly suppresses it
+    system.add_condition(AlertCondition("call_wall", 5900.0, distance_threshold=1.0))
+    system.check_all_conditions(5850.0)
+    system.conditions[1].trigger()
+    assert system.check_all_conditions(5900.0) == []
+    system.close()
@@ -0,0 +1,39 @@
+"""Tests for gamma_engine.GammaEngine level ranking."""
+import numpy as np
+import pandas as pd
+
+import gamma_engine
+from config import config
+from gamma_engine import GammaEngine
+
+
+def use_top_levels(monkeypatch, count):
+    # Config is frozen; swap in a copy for the engine module
+    monkeypatch.setattr(gamma_engine, "config", config.model_copy(update={"top_levels_count": count}))
+
+
+def test_rank_levels_skips_nan_scores(monkeypatch):
+    use_top_levels(monkeypatch, 2)
+    df = pd.DataFrame({
+        'strike': [5700.0, 5750.0, 5800.0, 5850.0],
+        'net_gamma': [1.0, np.nan, 3.0, 2.0],
+        'volume': [10.0, 1000.0, 10.0, 10.0],
+    })
+    
+    top_levels = GammaEngine().rank_levels(df)
+    
+    assert top_levels['strike'].tolist() == [5800.0, 5850.0]
+    assert top_levels['score'].tolist() == [30.0, 20.0]
+
+
+def test_rank_levels_matches_nlargest(monkeypatch):
+    use_top_levels(monkeypatch, 3)
+    df = pd.DataFrame({
+        'strike': [5700.0, 5750.0, 5800.0, 5850.0, 5900.0],
+        'net_gamma': [-5.0, 1.0, np.nan, 4.0, 2.0],
+        'volume': [2.0, 10.0, 50.0, 2.0, 5.0],
+    })
+    
+    expected = df.assign(score=df['net_gamma'].abs() * df['volume']).nlargest(3, 'score')
+    
+    assert GammaEngine().rank_levels(df)['strike'].tolist() == expected['strike'].tolist()